@@ -3,7 +3,7 @@ from logging.handlers import TimedRotatingFileHandler
 import verboselogs
 
 from mate.utils.version import get_version
-from mate.motors import set_motor, stop_all_motors
+from mate.motors import set_motor, set_motors, stop_all_motors
 
 
 class State(object):
@@ -0,0 +1,61 @@
+"""Benchmarks of the motor command path."""
+import threading
+import time
+
+from mate.bus import CommandBus
+from mate.motors import MotorError, get_motor_driver, set_motors, stop_all_motors
+
+LOAD_MOTORS = range(8)
+
+
+def stop_latency(count=1000, load=True):
+    """
+    Measure the time from a stop request to the end of its register write.
+    :param count: number of stops.
+    :param load: keep the bus full of frames while stopping, so every stop has to preempt them.
+        The frames sweep motors 0-7 over the full pulse width range, so this is refused on a
+        driver that moves real motors.
+    :return: sorted list of latencies in seconds.
+    """
+    driver = get_motor_driver()
+    if load and driver.hardware:
+        raise MotorError(
+            "The loaded stop benchmark drives motors {}-{} at up to full power and is not run on the {} driver. "
+            "Use --idle, which only stops the motors, or another driver.".format(
+                LOAD_MOTORS[0], LOAD_MOTORS[-1], driver.name
+            )
+        )
+    written = []
+
+    def stop():
+        stop_all_motors()
+        written.append(time.perf_counter())
+
+    bus = CommandBus(write=set_motors, stop=stop)
+    bus.start()
+    done = threading.Event()
+
+    def flood():
+        value = 0
+        while not done.is_set():
+            value = (value + 1) % 800
+            try:
+                bus.publish({motor: 1100 + value for motor in LOAD_MOTORS})
+            except MotorError:
+                time.sleep(0)
+
+    flooder = threading.Thread(target=flood, name="mate-bench-flood", daemon=True)
+    if load:
+        flooder.start()
+    latencies = []
+    try:
+        for _ in range(count):
+            received = time.perf_counter()
+            bus.publish_stop(wait=True)
+            latencies.append(written[-1] - received)
+    finally:
+        done.set()
+        if load:
+            flooder.join()
+        bus.close()
+    return sorted(latencies)
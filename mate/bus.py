@@ -0,0 +1,220 @@
+"""Single owner of the motor hardware inside a process.
+
+Frontends (CLI, HTTP and UDP servers, coalescers, the ramp engine) publish
+commands to the bus instead of calling mate.motors directly. One writer thread
+drains the bus, so hardware access is serialised in one place. The queue is a
+bounded priority queue: a stop preempts and discards every pending command, and
+consecutive pending frames are merged into one write with the newest value per
+motor winning.
+
+Every stop increments the bus generation. Stages that hold commands back, like
+the coalescer and the ramp engine, publish with the generation their commands
+were received in, so commands received before a stop are never written after it.
+
+Trace records published with a frame (see mate.trace) are stamped when the
+frame is taken off the queue and when its write returns.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from mate import metrics, trace
+from mate.motors import MotorError, check_frame, set_motors, stop_all_motors
+from mate.utils.defaults import BUS_QUEUE_SIZE, NUM_CHANNELS
+
+logger = logging.getLogger("mate")
+
+PRIORITY_STOP = 0
+PRIORITY_COMMAND = 1
+
+
+class Command(object):
+    """A frame or a stop waiting on the bus."""
+
+    __slots__ = ("frame", "done", "error", "published", "traces")
+
+    def __init__(self, frame, wait, traces=None):
+        self.frame = frame
+        self.done = threading.Event() if wait else None
+        self.error = None
+        self.published = time.perf_counter_ns()
+        self.traces = traces
+
+    def wait(self):
+        """Wait until the command has been written, raising its error if it failed."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class CommandBus(object):
+    """Bounded priority queue of motor commands drained by one writer thread."""
+
+    def __init__(self, maxsize=BUS_QUEUE_SIZE, write=set_motors, stop=stop_all_motors, channels=NUM_CHANNELS):
+        """
+        :param maxsize: pending frames before publish() fails. Stops are never refused.
+        :param write: function called with a dict of motor to microseconds.
+        :param stop: function called to stop all motors.
+        :param channels: number of motors accepted by publish().
+        """
+        self.maxsize = maxsize
+        self.channels = channels
+        self._write = write
+        self._stop = stop
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self.generation = 0
+        self.published = 0
+        self.writes = 0
+        self.merged = 0
+        self.discarded = 0
+        self._queue_latency = metrics.histogram("queue")
+
+    def publish(self, frame, wait=False, generation=None, traces=None):
+        """
+        Queue a frame.
+        :param frame: dict of motor to microseconds.
+        :param wait: block until the frame has been written.
+        :param generation: bus generation the frame was received in, the frame is
+            discarded when a stop has been published since.
+        :param traces: trace records of the commands in frame.
+        :raise MotorError: for an invalid frame (see mate.motors.check_frame) or a full bus.
+        """
+        # Frames are merged before they are written, so they are checked here.
+        check_frame(frame, self.channels)
+        command = Command(frame, wait, traces)
+        with self._condition:
+            if generation is not None and generation != self.generation:
+                self.discarded += 1
+                return
+            if len(self._heap) >= self.maxsize:
+                raise MotorError("Motor command bus is full.")
+            heapq.heappush(self._heap, (PRIORITY_COMMAND, next(self._sequence), command))
+            self.published += 1
+            self._condition.notify()
+        if wait:
+            command.wait()
+
+    def publish_stop(self, wait=False):
+        """
+        Stop all motors ahead of, and instead of, every pending frame.
+        :param wait: block until the motors have been stopped.
+        """
+        command = Command(None, wait)
+        with self._condition:
+            pending = [entry for entry in self._heap if entry[0] == PRIORITY_COMMAND]
+            self._heap = [entry for entry in self._heap if entry[0] != PRIORITY_COMMAND]
+            heapq.heapify(self._heap)
+            heapq.heappush(self._heap, (PRIORITY_STOP, next(self._sequence), command))
+            self.generation += 1
+            self.discarded += len(pending)
+            self._condition.notify()
+        for _, _, discarded in pending:
+            if discarded.done is not None:
+                discarded.error = MotorError("Motor command discarded by stop.")
+                discarded.done.set()
+        if wait:
+            command.wait()
+
+    def start(self):
+        """Start the writer thread."""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="mate-bus", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Write the pending commands and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _next(self):
+        """Wait for and remove the next commands to execute, merging consecutive frames."""
+        with self._condition:
+            while not self._heap:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            priority, _, command = heapq.heappop(self._heap)
+            commands = [command]
+            if priority == PRIORITY_COMMAND:
+                while self._heap and self._heap[0][0] == PRIORITY_COMMAND:
+                    commands.append(heapq.heappop(self._heap)[2])
+            return commands
+
+    def _run(self):
+        while True:
+            commands = self._next()
+            if commands is None:
+                return
+            traces = [record for command in commands if command.traces for record in command.traces]
+            trace.mark(traces, "dequeued")
+            try:
+                if commands[0].frame is None:
+                    self._stop()
+                else:
+                    frame = {}
+                    for command in commands:
+                        frame.update(command.frame)
+                    self._write(frame)
+                    trace.mark(traces, "written")
+                    self.merged += len(commands) - 1
+                self.writes += 1
+            # noinspection PyBroadException
+            except Exception as err:
+                for command in commands:
+                    command.error = err
+                if not any(command.done is not None for command in commands):
+                    logger.exception("Problem writing motor commands.")
+            now = time.perf_counter_ns()
+            for command in commands:
+                self._queue_latency.record(now - command.published)
+                if command.done is not None:
+                    command.done.set()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus():
+    """
+    Return the process wide command bus, starting it on first use.
+    :return: CommandBus
+    """
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = CommandBus()
+            _bus.start()
+        return _bus
+
+
+def publish(frame, wait=False, generation=None, traces=None):
+    """
+    Queue a frame on the process wide command bus.
+    :param frame: dict of motor to microseconds.
+    :param wait: block until the frame has been written.
+    :param generation: see CommandBus.publish().
+    :param traces: see CommandBus.publish().
+    """
+    get_bus().publish(frame, wait, generation, traces)
+
+
+def publish_stop(wait=False):
+    """
+    Stop all motors through the process wide command bus, ahead of pending frames.
+    :param wait: block until the motors have been stopped.
+    """
+    get_bus().publish_stop(wait)
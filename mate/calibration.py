@@ -0,0 +1,136 @@
+"""Per-motor calibration compiled into microseconds-to-ticks lookup tables.
+
+Calibration settings are loaded from YAML, for example:
+
+    defaults:
+      min: 1100          # lowest pulse width sent to the ESC
+      max: 1900          # highest pulse width sent to the ESC
+      neutral: 1500      # stopped
+      deadband: 25       # commands within neutral +/- deadband are sent as neutral
+      trim: 0            # added to the output pulse width
+      reverse: false     # mirror commands around neutral
+      slew: 0            # microseconds per second for mate.ramp, 0 for no limit
+    motors:
+      2:
+        trim: -8
+      5:
+        reverse: true
+        # Thrust curve as [command, output] points, linearly interpolated.
+        curve: [[1100, 1180], [1500, 1500], [1900, 1820]]
+
+Every setting is optional. When the driver is opened the settings are compiled
+into a table with one row per motor and one column per microsecond, so the
+conversion done for each command is a single index operation.
+"""
+import numpy as np
+from yaml import load
+try:
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader
+
+from mate.drivers import MotorError
+from mate.utils.defaults import (
+    MAX_MICROSECONDS,
+    MIN_MICROSECONDS,
+    NEUTRAL_MICROSECONDS,
+    PCA9685_RESOLUTION,
+)
+
+DEFAULT_SETTINGS = {
+    "min": MIN_MICROSECONDS,
+    "max": MAX_MICROSECONDS,
+    "neutral": NEUTRAL_MICROSECONDS,
+    "deadband": 0,
+    "trim": 0,
+    "reverse": False,
+    "curve": None,
+    "slew": 0,
+}
+
+
+def microseconds_to_ticks(microseconds, frequency):
+    """
+    Convert pulse widths to PCA9685 ticks.
+    :param microseconds: pulse width or numpy array of pulse widths.
+    :param frequency: PWM frequency in Hz.
+    :return: ticks, rounded to the nearest tick.
+    """
+    return np.rint(np.asarray(microseconds) * (frequency * PCA9685_RESOLUTION / 1000000.0)).astype(np.uint16)
+
+
+def load_settings(filename):
+    """
+    Load calibration settings from a YAML file.
+    :param filename: path of the YAML file.
+    :return: dict
+    """
+    try:
+        with open(filename) as settings_file:
+            settings = load(settings_file, Loader=Loader)
+    except OSError as err:
+        raise MotorError("Unable to read calibration file {}: {}".format(filename, err))
+    return settings or {}
+
+
+def motor_settings(settings, motor):
+    """
+    Return the settings of one motor, with defaults filled in.
+    :param settings: dict loaded by load_settings().
+    :param motor: motor number.
+    :return: dict
+    """
+    result = dict(DEFAULT_SETTINGS)
+    result.update(settings.get("defaults") or {})
+    result.update((settings.get("motors") or {}).get(motor) or {})
+    unknown = set(result) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise MotorError("Unknown calibration settings {} for motor {}.".format(", ".join(sorted(unknown)), motor))
+    if not result["min"] <= result["neutral"] <= result["max"]:
+        raise MotorError("Calibration for motor {} needs min <= neutral <= max.".format(motor))
+    return result
+
+
+class Calibration(object):
+    """Compiled lookup tables for all channels of a driver."""
+
+    def __init__(self, settings, channels, frequency):
+        """
+        :param settings: dict loaded by load_settings().
+        :param channels: number of motor channels.
+        :param frequency: PWM frequency in Hz.
+        """
+        motors = [motor_settings(settings, motor) for motor in range(channels)]
+        self.low = min(motor["min"] for motor in motors)
+        self.high = max(motor["max"] for motor in motors)
+        commands = np.arange(self.low, self.high + 1, dtype=np.float64)
+        self.table = np.empty((channels, len(commands)), dtype=np.uint16)
+        self.neutral_microseconds = [motor["neutral"] for motor in motors]
+        self.slew = [motor["slew"] for motor in motors]
+        self.neutral_ticks = []
+        for row, motor in enumerate(motors):
+            self.table[row] = microseconds_to_ticks(self._output(motor, commands), frequency)
+            self.neutral_ticks.append(self.ticks(row, motor["neutral"]))
+
+    @staticmethod
+    def _output(motor, commands):
+        """Return the pulse widths sent to the ESC for an array of commands."""
+        neutral = motor["neutral"]
+        output = np.clip(commands, motor["min"], motor["max"])
+        output = np.where(np.abs(output - neutral) <= motor["deadband"], neutral, output)
+        if motor["reverse"]:
+            output = 2 * neutral - output
+        if motor["curve"]:
+            points = np.array(sorted(motor["curve"]), dtype=np.float64)
+            output = np.interp(output, points[:, 0], points[:, 1])
+        return np.clip(output + motor["trim"], motor["min"], motor["max"])
+
+    def ticks(self, motor, microseconds):
+        """
+        Look up the ticks for a command.
+        :param motor: motor number.
+        :param microseconds: commanded pulse width.
+        :return: int
+        """
+        index = min(max(int(microseconds), self.low), self.high) - self.low
+        return self.table.item(motor, index)
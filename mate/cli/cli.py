@@ -1,7 +1,10 @@
+import functools
+import json
 import logging
 import os
 import time
 import traceback
+import urllib.request
 from pprint import pprint
 
 import click
@@ -15,8 +18,29 @@ from click_repl import repl
 from click_repl.exceptions import ExitReplException
 from prompt_toolkit.history import FileHistory
 
-from mate import logger, setup_logger
-from mate.motors import set_motor, stop_all_motors
+from mate import logger, metrics, setup_logger, trace
+from mate.bench import stop_latency
+from mate.drivers import DRIVERS
+from mate.mixer import AXES, Mixer
+from mate.bus import publish, publish_stop
+from mate.motors import configure
+from mate.server import udp, web
+from mate.utils.defaults import (
+    ACK_EVERY,
+    ACK_INTERVAL,
+    CALIBRATION_ENV_VAR,
+    DRIVER_ENV_VAR,
+    FLUSH_RATE,
+    HTTP_BACKLOG,
+    HTTP_HOST,
+    HTTP_KEEP_ALIVE,
+    HTTP_PORT,
+    HTTP_WORKERS,
+    OWNER_PORT,
+    OWNER_STATUS_PORT,
+    UDP_HOST,
+    UDP_PORT,
+)
 from mate.utils.version import get_version
 
 
@@ -35,11 +59,26 @@ def exit_on_non_confirmation_callback(ctx, param, value):
 @click.option(
     "--debug", "-d", default=False, is_flag=True, help="Turn on debug messages."
 )
+@click.option(
+    "--driver",
+    type=click.Choice(sorted(DRIVERS)),
+    default=None,
+    envvar=DRIVER_ENV_VAR,
+    help="Motor driver backend (default: simulated).",
+)
+@click.option(
+    "--calibration",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    envvar=CALIBRATION_ENV_VAR,
+    help="YAML file with per-motor calibration.",
+)
 @click.pass_context
-def cli(ctx, debug):
+def cli(ctx, debug, driver, calibration):
     """CLI and Python module for testing SparkFun RASPBERRY PI Servo Hat."""
     setup_logger(debug)
     logger.debug("Logging enabled ....")
+    configure(driver, calibration=calibration)
     if not os.path.exists(HISTORY_FILE):
         with open(HISTORY_FILE, "w+") as file:
             file.write("")
@@ -82,6 +121,22 @@ def command_q(ctx):
     raise ExitReplException
 
 
+@click.command(name="bench-stop")
+@click.option("--count", "-n", default=1000, type=click.IntRange(1), help="Number of stops.")
+@click.option("--idle", default=False, is_flag=True, help="Do not load the bus with frames while stopping.")
+def command_bench_stop(count, idle):
+    """Measure stop latency from request to register write."""
+    try:
+        latencies = stop_latency(count, load=not idle)
+    except RuntimeError as err:
+        click.echo(str(err), color='red', err=True)
+        logging.exception("Problem measuring stop latency.")
+        return
+    for label, fraction in (("p50", 0.5), ("p99", 0.99), ("p999", 0.999)):
+        click.echo("{:5s} {:9.1f} us".format(label, latencies[int(fraction * (len(latencies) - 1))] * 1e6))
+    click.echo("{:5s} {:9.1f} us".format("max", latencies[-1] * 1e6))
+
+
 @click.command(name="help")
 @click.argument("topic", default=None, required=False, nargs=1)
 @click.pass_context
@@ -106,12 +161,47 @@ def command_help(ctx, topic):
 def command_go(motor, microseconds, debug):
     """Set the pwm value for a motor."""
     try:
-        set_motor(motor, microseconds)
+        publish({motor: microseconds}, wait=True)
+        logger.info("Set motor {} to {} microseconds.".format(motor, microseconds))
     except RuntimeError as err:
         click.echo(str(err), color='red', err=True)
         logging.exception("Problem setting PWM value for motor {} to {}".format(motor, microseconds))
 
 
+# noinspection PyUnusedLocal
+@click.command(name='frame')
+@click.argument('microseconds', type=int, nargs=-1, required=True)
+@click.option('--first', '-f', default=0, type=int, help='Motor of the first value.')
+@click.option('--debug', '-d', default=False, is_flag=True, help='Turn on debug messages.')
+def command_frame(microseconds, first, debug):
+    """Set the pwm values for consecutive motors in one write."""
+    frame = {first + offset: value for offset, value in enumerate(microseconds)}
+    try:
+        publish(frame, wait=True)
+        logger.info("Set motors {}.".format(frame))
+    except RuntimeError as err:
+        click.echo(str(err), color='red', err=True)
+        logging.exception("Problem setting PWM values {}".format(frame))
+
+
+# noinspection PyUnusedLocal
+# Negative axes like -0.3 are values, not options.
+@click.command(name='mix', context_settings={"ignore_unknown_options": True})
+@click.argument('command', type=click.FloatRange(-1.0, 1.0), nargs=len(AXES))
+@click.option('--mixer', '-m', 'mixer_file', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='YAML file with the thruster allocation matrix.')
+@click.option('--debug', '-d', default=False, is_flag=True, help='Turn on debug messages.')
+def command_mix(command, mixer_file, debug):
+    """Set all thrusters from SURGE SWAY HEAVE ROLL PITCH YAW (-1 to 1)."""
+    try:
+        mixer = Mixer.from_yaml(mixer_file) if mixer_file else Mixer()
+        frame = mixer.apply(command, write=functools.partial(publish, wait=True))
+        logger.info("Set motors {}.".format(frame))
+    except RuntimeError as err:
+        click.echo(str(err), color='red', err=True)
+        logging.exception("Problem mixing command {}".format(command))
+
+
 @click.command(name="repl", hidden=True)
 def command_repl():
     """Start mate in a read-eval-print-loop (REPL) interactive shell."""
@@ -134,6 +224,112 @@ def command_version():
     print("Mate v{}".format(get_version()))
 
 
+@click.command(name="serve-http")
+@click.option("--host", default=HTTP_HOST, help="Address to bind.")
+@click.option("--port", "-p", default=HTTP_PORT, type=int, help="TCP port.")
+@click.option("--workers", "-w", default=HTTP_WORKERS, type=click.IntRange(1), help="Worker processes.")
+@click.option("--backlog", default=HTTP_BACKLOG, type=click.IntRange(1), help="Listen backlog.")
+@click.option("--limit-concurrency", default=None, type=click.IntRange(1),
+              help="Connections per worker before requests get 503 responses.")
+@click.option("--keep-alive", default=HTTP_KEEP_ALIVE, type=click.IntRange(1),
+              help="Seconds an idle keep-alive connection is kept open.")
+@click.option("--owner-port", default=OWNER_PORT, type=int,
+              help="Loopback UDP port of the motor owner (several workers).")
+@click.option("--owner-status-port", default=OWNER_STATUS_PORT, type=int,
+              help="Loopback TCP port of the motor owner status endpoint (several workers).")
+@click.option('--mixer', '-m', 'mixer_file', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='YAML file with the thruster allocation matrix for POST /mix.')
+@click.option("--ramp", default=False, is_flag=True,
+              help="Ramp the motors to each command at the calibrated 'slew' rates instead of stepping them.")
+def command_serve_http(
+    host, port, workers, backlog, limit_concurrency, keep_alive, owner_port, owner_status_port, mixer_file, ramp
+):
+    """Run the HTTP motor API with the REST, WebSocket and telemetry endpoints."""
+    try:
+        web.run(
+            host,
+            port,
+            workers,
+            backlog,
+            limit_concurrency,
+            keep_alive,
+            owner_port,
+            owner_status_port,
+            mixer_file,
+            ramp,
+        )
+    except (OSError, RuntimeError) as err:
+        click.echo(str(err), color='red', err=True)
+        logging.exception("Problem running the HTTP motor server.")
+
+
+@click.command(name="serve-udp")
+@click.option("--host", default=UDP_HOST, help="Address to bind.")
+@click.option("--port", "-p", default=UDP_PORT, type=int, help="UDP port.")
+@click.option("--rate", "-r", default=FLUSH_RATE, type=click.FloatRange(min=1.0), help="Motor writes per second.")
+@click.option("--ack-every", default=ACK_EVERY, type=click.IntRange(1), help="Datagrams per acknowledgement.")
+@click.option("--ack-interval", default=ACK_INTERVAL * 1000, type=click.FloatRange(min=1.0),
+              help="Milliseconds before a datagram is acknowledged.")
+@click.option("--status-port", default=None, type=int, help="TCP port serving /stats and /trace over HTTP.")
+@click.option("--ramp", default=False, is_flag=True,
+              help="Ramp the motors to each command at the calibrated 'slew' rates instead of stepping them.")
+def command_serve_udp(host, port, rate, ack_every, ack_interval, status_port, ramp):
+    """Run the UDP motor server."""
+    try:
+        udp.run(host, port, rate, ack_every, ack_interval / 1000.0, status_port, ramp)
+    except (OSError, RuntimeError) as err:
+        click.echo(str(err), color='red', err=True)
+        logging.exception("Problem running the UDP motor server.")
+
+
+@click.command(name="stats")
+@click.option("--url", "-u", default=None, help="Read the metrics of a running server, e.g. http://vehicle:5000/stats.")
+@click.option("--json", "as_json", default=False, is_flag=True, help="Print the metrics as JSON.")
+@click.option("--reset", default=False, is_flag=True, help="Forget the metrics of this process after printing them.")
+def command_stats(url, as_json, reset):
+    """Show counters and per-stage latency percentiles."""
+    if url is None:
+        data = metrics.snapshot()
+        if reset:
+            metrics.reset()
+    else:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                data = json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError) as err:
+            click.echo(str(err), color='red', err=True)
+            logging.exception("Problem reading metrics from {}".format(url))
+            return
+    click.echo(json.dumps(data, indent=2, sort_keys=True) if as_json else metrics.format_snapshot(data))
+
+
+@click.group(name="trace")
+def command_trace():
+    """Inspect traced motor commands."""
+
+
+@click.command(name="dump")
+@click.option("--last", "-n", default=20, type=click.IntRange(1), help="Number of most recent commands.")
+@click.option("--url", "-u", default=None, help="Read the traces of a running server, e.g. http://vehicle:5000/trace.")
+@click.option("--json", "as_json", default=False, is_flag=True, help="Print the trace records as JSON.")
+def command_trace_dump(last, url, as_json):
+    """Print the per-stage latency (us) of the last traced commands."""
+    if url is None:
+        records = trace.records(last)
+    else:
+        try:
+            with urllib.request.urlopen("{}?last={}".format(url, last), timeout=5) as response:
+                records = json.loads(response.read().decode("utf-8"))
+        except (OSError, ValueError) as err:
+            click.echo(str(err), color='red', err=True)
+            logging.exception("Problem reading traces from {}".format(url))
+            return
+    click.echo(json.dumps(records, indent=2) if as_json else trace.format_records(records))
+
+
+command_trace.add_command(command_trace_dump)
+
+
 # noinspection PyUnusedLocal
 @click.command(name='stop')
 @click.option('--debug', '-d', default=False, is_flag=True, help='Turn on debug messages.')
@@ -141,17 +337,25 @@ def command_stop(debug):
     """Stop all motors
     """
     try:
-        stop_all_motors()
+        publish_stop(wait=True)
+        logger.info("Stopped all motors.")
     except RuntimeError as err:
         click.echo(str(err), color='red', err=True)
         logging.exception("Problem stopping all motors.")
 
 
+cli.add_command(command_bench_stop)
 cli.add_command(command_e)
 cli.add_command(command_exit)
 cli.add_command(command_q)
 cli.add_command(command_quit)
 cli.add_command(command_help)
+cli.add_command(command_frame)
 cli.add_command(command_go)
+cli.add_command(command_mix)
 cli.add_command(command_repl)
+cli.add_command(command_serve_http)
+cli.add_command(command_serve_udp)
+cli.add_command(command_stats)
 cli.add_command(command_stop)
+cli.add_command(command_trace)
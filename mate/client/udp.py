@@ -0,0 +1,198 @@
+"""Client for the UDP motor server.
+
+Commands are sent as sequenced binary frames (see mate.protocol) from a
+preallocated buffer over a connected socket. The server acknowledges them
+cumulatively, so the client keeps up to window commands in flight and only
+waits when the window is full. Each acknowledgement echoes the timestamp of
+the newest command it covers, which gives the round trip time including the
+server's acknowledgement delay. Commands sent with a trace id are traced
+through the server stages, see mate.trace.
+
+A send blocks only when the window is full, and never without a window, for at most timeout seconds per
+acknowledgement it waits for. While the server is down the commands are still
+sent and the refused ones are counted as lost instead of raising.
+
+    with MotorClient("10.0.0.2") as client:
+        client.set_motor(1, 1600)
+        client.set_motors({0: 1500, 1: 1600, 2: 1400})
+        client.stream(frames, rate_hz=100)
+        print(client.stats())
+"""
+import collections
+import select
+import socket
+import time
+
+from mate.protocol import (
+    ACK,
+    MAX_MOTORS,
+    SEQUENCE_MASK,
+    ProtocolError,
+    binary_size,
+    decode_ack,
+    pack_binary_into,
+    sequence_newer,
+    timestamp_now,
+)
+from mate.utils.defaults import ACK_TIMEOUT, CLIENT_WINDOW, UDP_PORT
+
+RTT_SAMPLES = 1024
+
+
+class MotorClient(object):
+    """Send motor commands over UDP with a window of unacknowledged commands."""
+
+    def __init__(self, host, port=UDP_PORT, window=CLIENT_WINDOW, timeout=ACK_TIMEOUT):
+        """
+        :param host: address of the UDP motor server.
+        :param port: UDP port of the server.
+        :param window: commands in flight before a send waits for an acknowledgement,
+            None to never wait.
+        :param timeout: seconds to wait for an acknowledgement before assuming it was lost.
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.sock.setblocking(False)
+        self.timeout = timeout
+        self.window = window
+        self._send_buffer = bytearray(binary_size(MAX_MOTORS, traced=True))
+        self._send_view = memoryview(self._send_buffer)
+        self._ack_buffer = bytearray(ACK.size * 2)
+        self._ack_view = memoryview(self._ack_buffer)
+        self.sequence = 0
+        self.acknowledged = 0
+        self.sent = 0
+        self.acks = 0
+        self.timeouts = 0
+        self.refused = 0
+        self.started = None
+        self.rtt = collections.deque(maxlen=RTT_SAMPLES)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def in_flight(self):
+        """Number of commands sent and not yet acknowledged."""
+        return (self.sequence - self.acknowledged) & SEQUENCE_MASK
+
+    def set_motor(self, motor, microseconds, trace=None):
+        """Send a command for one motor, traced when trace is given."""
+        self.send({motor: microseconds}, trace)
+
+    def set_motors(self, frame, trace=None):
+        """
+        Send a command for several motors in one datagram.
+        :param frame: mapping of motor to microseconds, or a sequence indexed by motor
+            where None leaves that motor unchanged.
+        :param trace: trace id of the command.
+        """
+        if not hasattr(frame, "items"):
+            frame = {motor: microseconds for motor, microseconds in enumerate(frame) if microseconds is not None}
+        self.send(frame, trace)
+
+    def stream(self, frames, rate_hz):
+        """
+        Send frames at a steady rate.
+        :param frames: iterable of frames accepted by set_motors().
+        :param rate_hz: frames per second.
+        :return: number of frames sent.
+        """
+        period = 1.0 / rate_hz
+        start = time.perf_counter()
+        count = 0
+        for count, frame in enumerate(frames, 1):
+            self.set_motors(frame)
+            # Pace against the start time so sleep overshoot does not accumulate.
+            delay = start + count * period - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return count
+
+    def send(self, frame, trace=None):
+        """
+        Send a frame. When window commands are in flight this blocks until an
+        acknowledgement arrives, or for up to timeout seconds before the unacknowledged
+        commands are given up as lost. Without a window it never blocks.
+        :param frame: dict of motor to microseconds.
+        :param trace: trace id of the command.
+        """
+        self.receive_acks()
+        while self.window is not None and self.in_flight >= self.window:
+            if not self.receive_acks(self.timeout) and self.in_flight >= self.window:
+                # Acknowledgements are not retransmitted, give up on the lost ones.
+                self.timeouts += 1
+                self.acknowledged = self.sequence
+        sequence = (self.sequence + 1) & SEQUENCE_MASK
+        size = pack_binary_into(self._send_buffer, 0, frame, sequence, trace=trace)
+        try:
+            self.sock.send(self._send_view[:size])
+        except ConnectionRefusedError:
+            # The error of an earlier datagram, reporting it cleared it.
+            self._refused()
+            self.sock.send(self._send_view[:size])
+        self.sequence = sequence
+        self.sent += 1
+        if self.started is None:
+            self.started = time.perf_counter()
+
+    def receive_acks(self, timeout=0):
+        """
+        Read the acknowledgements that have arrived.
+        :param timeout: seconds to wait for an acknowledgement if none has arrived.
+        :return: number of acknowledgements read.
+        """
+        if timeout and not select.select([self.sock], [], [], timeout)[0]:
+            return 0
+        count = 0
+        while True:
+            try:
+                size = self.sock.recv_into(self._ack_buffer)
+            except (BlockingIOError, InterruptedError):
+                return count
+            except ConnectionRefusedError:
+                self._refused()
+                return count
+            try:
+                ack = decode_ack(self._ack_view[:size])
+            except ProtocolError:
+                continue
+            count += 1
+            self.acks += 1
+            if ack.timestamp:
+                self.rtt.append(timestamp_now() - ack.timestamp)
+            if sequence_newer(ack.sequence, self.acknowledged):
+                self.acknowledged = ack.sequence
+
+    def _refused(self):
+        # Nothing listens on the server port, the commands in flight are lost.
+        self.refused += 1
+        self.acknowledged = self.sequence
+
+    def stats(self):
+        """
+        Return client side statistics.
+        :return: dict with sent, acks, timeouts, refused, in_flight, send_rate (commands/s) and
+            rtt_p50, rtt_p90, rtt_p99 and rtt_max in milliseconds over the last RTT_SAMPLES
+            acknowledgements.
+        """
+        elapsed = time.perf_counter() - self.started if self.started is not None else 0
+        result = {
+            "sent": self.sent,
+            "acks": self.acks,
+            "timeouts": self.timeouts,
+            "refused": self.refused,
+            "in_flight": self.in_flight,
+            "send_rate": self.sent / elapsed if elapsed else 0.0,
+        }
+        rtt = sorted(self.rtt)
+        for label, fraction in (("rtt_p50", 0.5), ("rtt_p90", 0.9), ("rtt_p99", 0.99), ("rtt_max", 1.0)):
+            result[label] = rtt[int(fraction * (len(rtt) - 1))] / 1000.0 if rtt else None
+        return result
+
+    def close(self):
+        """Close the socket."""
+        self.sock.close()
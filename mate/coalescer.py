@@ -0,0 +1,123 @@
+"""Latest-value-wins buffering of motor commands.
+
+Frontends can receive commands much faster than the bus needs them. The
+coalescer keeps only the newest value per motor and a single writer thread
+publishes the pending values to the motor command bus (mate.bus) at a fixed
+rate, so the ingest rate is decoupled from the bus rate. Trace records of
+traced commands (see mate.trace) are passed on with the values they carried.
+"""
+import logging
+import threading
+import time
+
+from mate import metrics, trace
+from mate.bus import get_bus
+from mate.motors import check_frame
+from mate.utils.defaults import FLUSH_RATE, NUM_CHANNELS
+
+logger = logging.getLogger("mate")
+
+
+class CommandCoalescer(object):
+    """Keep the newest command per motor and flush them from one thread."""
+
+    def __init__(self, rate=FLUSH_RATE, bus=None, channels=NUM_CHANNELS):
+        """
+        :param rate: flushes per second.
+        :param bus: CommandBus, defaults to the process wide bus.
+        :param channels: number of motors accepted by submit().
+        """
+        self.period = 1.0 / rate
+        self.channels = channels
+        self.bus = bus or get_bus()
+        self._generation = self.bus.generation
+        self._pending = {}
+        self._traces = []
+        self._updated = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.received = 0
+        self.superseded = 0
+        self.flushes = 0
+        self._coalesce_latency = metrics.histogram("coalesce")
+
+    def submit(self, frame, traces=None):
+        """
+        Queue commands, replacing any pending command for the same motor.
+        :param frame: dict of motor to microseconds.
+        :param traces: trace records of the commands in frame.
+        """
+        check_frame(frame, self.channels)
+        with self._lock:
+            if self._generation != self.bus.generation:
+                # Motors were stopped, the pending commands must not be written.
+                self._pending = {}
+                self._traces = []
+                self._generation = self.bus.generation
+            for motor, microseconds in frame.items():
+                if motor in self._pending:
+                    self.superseded += 1
+                self._pending[motor] = microseconds
+            self._updated = time.perf_counter_ns()
+            if traces:
+                self._traces.extend(traces)
+            self.received += len(frame)
+        self._dirty.set()
+
+    def set_motor(self, motor, microseconds):
+        """Queue a command for one motor."""
+        self.submit({motor: microseconds})
+
+    def clear(self):
+        """Drop all pending commands."""
+        with self._lock:
+            self._pending = {}
+            self._traces = []
+            self._dirty.clear()
+
+    def flush(self):
+        """Write the pending commands now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            traces, self._traces = self._traces, []
+            generation = self._generation
+            updated = self._updated
+            self._dirty.clear()
+        if pending:
+            self._coalesce_latency.record(time.perf_counter_ns() - updated)
+            trace.mark(traces, "published")
+            self.bus.publish(pending, generation=generation, traces=traces)
+            self.flushes += 1
+
+    def start(self):
+        """Start the writer thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="mate-coalescer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread after writing the pending commands."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._dirty.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        next_flush = time.monotonic()
+        while not self._stopped.is_set():
+            self._dirty.wait()
+            if self._stopped.is_set():
+                return
+            delay = next_flush - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.flush()
+            except RuntimeError:
+                logger.exception("Problem writing coalesced motor commands.")
+            next_flush = time.monotonic() + self.period
@@ -20,4 +20,6 @@ from controller.api.default_api import DefaultApi
 from controller.api_client import ApiClient
 from controller.configuration import Configuration
 # import models into sdk package
+from controller.models.mix_request import MixRequest
 from controller.models.motor_request import MotorRequest
+from controller.models.motors_request import MotorsRequest
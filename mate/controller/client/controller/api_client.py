@@ -10,13 +10,14 @@
 """
 from __future__ import absolute_import
 
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import json
 import mimetypes
-from multiprocessing.pool import ThreadPool
 import os
 import re
 import tempfile
+import threading
 
 # python 2 and python 3 compatibility library
 import six
@@ -25,6 +26,7 @@ from six.moves.urllib.parse import quote
 from controller.configuration import Configuration
 import controller.models
 from controller import rest
+from controller.serializers import DESERIALIZERS, SERIALIZERS
 
 
 class ApiClient(object):
@@ -65,7 +67,9 @@ class ApiClient(object):
             configuration = Configuration()
         self.configuration = configuration
 
-        self.pool = ThreadPool()
+        # Created by the first async_req call, see the pool property.
+        self._pool = None
+        self._pool_lock = threading.Lock()
         self.rest_client = rest.RESTClientObject(configuration)
         self.default_headers = {}
         if header_name is not None:
@@ -75,8 +79,20 @@ class ApiClient(object):
         self.user_agent = 'Swagger-Codegen/1.0.0/python'
 
     def __del__(self):
-        self.pool.close()
-        self.pool.join()
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    @property
+    def pool(self):
+        """Executor of the async_req calls, with
+        Configuration.pool_threads threads, created on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.configuration.pool_threads)
+        return self._pool
 
     @property
     def user_agent(self):
@@ -176,13 +192,17 @@ class ApiClient(object):
             convert to string in iso8601 format.
         If obj is list, sanitize each element in the list.
         If obj is dict, return the dict.
-        If obj is swagger model, return the properties dict.
+        If obj is swagger model, return the properties dict, with the
+            serializer compiled for its class if there is one.
 
         :param obj: The data to serialize.
         :return: The serialized form of data.
         """
         if obj is None:
             return None
+        serializer = SERIALIZERS.get(type(obj))
+        if serializer is not None:
+            return serializer(obj)
         elif isinstance(obj, self.PRIMITIVE_TYPES):
             return obj
         elif isinstance(obj, list):
@@ -308,7 +328,8 @@ class ApiClient(object):
         :return:
             If async_req parameter is True,
             the request will be called asynchronously.
-            The method will return the request thread.
+            The method will return a concurrent.futures.Future of the
+            response.
             If parameter async_req is False or missing,
             then the method will return the response directly.
         """
@@ -320,15 +341,14 @@ class ApiClient(object):
                                    _return_http_data_only, collection_formats,
                                    _preload_content, _request_timeout)
         else:
-            thread = self.pool.apply_async(self.__call_api, (resource_path,
-                                           method, path_params, query_params,
-                                           header_params, body,
-                                           post_params, files,
-                                           response_type, auth_settings,
-                                           _return_http_data_only,
-                                           collection_formats,
-                                           _preload_content, _request_timeout))
-        return thread
+            return self.pool.submit(self.__call_api, resource_path,
+                                    method, path_params, query_params,
+                                    header_params, body,
+                                    post_params, files,
+                                    response_type, auth_settings,
+                                    _return_http_data_only,
+                                    collection_formats,
+                                    _preload_content, _request_timeout)
 
     def request(self, method, url, query_params=None, headers=None,
                 post_params=None, body=None, _preload_content=True,
@@ -600,6 +620,9 @@ class ApiClient(object):
         :param klass: class literal.
         :return: model object.
         """
+        deserializer = DESERIALIZERS.get(klass)
+        if deserializer is not None and isinstance(data, dict):
+            return deserializer(data)
 
         if not klass.swagger_types and not self.__hasattr(klass, 'get_real_child_model'):
             return data
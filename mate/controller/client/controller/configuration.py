@@ -95,6 +95,9 @@ class Configuration(six.with_metaclass(TypeWithDefault, object)):
         # requests to the same host, which is often the case here.
         # cpu_count * 5 is used as default value to increase performance.
         self.connection_pool_maxsize = multiprocessing.cpu_count() * 5
+        # Threads of the executor running async_req calls. The executor is
+        # only created by the first async_req call.
+        self.pool_threads = multiprocessing.cpu_count()
 
         # Proxy URL
         self.proxy = None
@@ -14,4 +14,6 @@
 from __future__ import absolute_import
 
 # import models into model package
+from controller.models.mix_request import MixRequest
 from controller.models.motor_request import MotorRequest
+from controller.models.motors_request import MotorsRequest
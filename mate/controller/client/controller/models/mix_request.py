@@ -0,0 +1,285 @@
+# coding: utf-8
+
+"""
+    X Academy ROV controller
+
+    API to control ROV  # noqa: E501
+
+    OpenAPI spec version: 0.7.0
+    
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+import pprint
+import re  # noqa: F401
+
+import six
+
+from controller import serializers
+
+class MixRequest(object):
+    """NOTE: This class is auto generated by the swagger code generator program.
+
+    Do not edit the class manually.
+    """
+    """
+    Attributes:
+      swagger_types (dict): The key is attribute name
+                            and the value is attribute type.
+      attribute_map (dict): The key is attribute name
+                            and the value is json key in definition.
+    """
+    swagger_types = {
+        'surge': 'float',
+        'sway': 'float',
+        'heave': 'float',
+        'roll': 'float',
+        'pitch': 'float',
+        'yaw': 'float'
+    }
+
+    attribute_map = {
+        'surge': 'surge',
+        'sway': 'sway',
+        'heave': 'heave',
+        'roll': 'roll',
+        'pitch': 'pitch',
+        'yaw': 'yaw'
+    }
+
+    __slots__ = ('_surge', '_sway', '_heave', '_roll', '_pitch', '_yaw',
+                 'discriminator')
+
+    def __init__(self, surge=None, sway=None, heave=None, roll=None, pitch=None, yaw=None):  # noqa: E501
+        """MixRequest - a model defined in Swagger"""  # noqa: E501
+        self._surge = None
+        self._sway = None
+        self._heave = None
+        self._roll = None
+        self._pitch = None
+        self._yaw = None
+        self.discriminator = None
+        if surge is not None:
+            self.surge = surge
+        if sway is not None:
+            self.sway = sway
+        if heave is not None:
+            self.heave = heave
+        if roll is not None:
+            self.roll = roll
+        if pitch is not None:
+            self.pitch = pitch
+        if yaw is not None:
+            self.yaw = yaw
+
+    @property
+    def surge(self):
+        """Gets the surge of this MixRequest.  # noqa: E501
+
+        Forward thrust.  # noqa: E501
+
+        :return: The surge of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._surge
+
+    @surge.setter
+    def surge(self, surge):
+        """Sets the surge of this MixRequest.
+
+        Forward thrust.  # noqa: E501
+
+        :param surge: The surge of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if surge is not None and surge > 1:  # noqa: E501
+            raise ValueError("Invalid value for `surge`, must be a value less than or equal to `1`")  # noqa: E501
+        if surge is not None and surge < -1:  # noqa: E501
+            raise ValueError("Invalid value for `surge`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._surge = surge
+
+    @property
+    def sway(self):
+        """Gets the sway of this MixRequest.  # noqa: E501
+
+        Sideways thrust.  # noqa: E501
+
+        :return: The sway of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._sway
+
+    @sway.setter
+    def sway(self, sway):
+        """Sets the sway of this MixRequest.
+
+        Sideways thrust.  # noqa: E501
+
+        :param sway: The sway of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if sway is not None and sway > 1:  # noqa: E501
+            raise ValueError("Invalid value for `sway`, must be a value less than or equal to `1`")  # noqa: E501
+        if sway is not None and sway < -1:  # noqa: E501
+            raise ValueError("Invalid value for `sway`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._sway = sway
+
+    @property
+    def heave(self):
+        """Gets the heave of this MixRequest.  # noqa: E501
+
+        Vertical thrust.  # noqa: E501
+
+        :return: The heave of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._heave
+
+    @heave.setter
+    def heave(self, heave):
+        """Sets the heave of this MixRequest.
+
+        Vertical thrust.  # noqa: E501
+
+        :param heave: The heave of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if heave is not None and heave > 1:  # noqa: E501
+            raise ValueError("Invalid value for `heave`, must be a value less than or equal to `1`")  # noqa: E501
+        if heave is not None and heave < -1:  # noqa: E501
+            raise ValueError("Invalid value for `heave`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._heave = heave
+
+    @property
+    def roll(self):
+        """Gets the roll of this MixRequest.  # noqa: E501
+
+        Roll moment.  # noqa: E501
+
+        :return: The roll of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._roll
+
+    @roll.setter
+    def roll(self, roll):
+        """Sets the roll of this MixRequest.
+
+        Roll moment.  # noqa: E501
+
+        :param roll: The roll of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if roll is not None and roll > 1:  # noqa: E501
+            raise ValueError("Invalid value for `roll`, must be a value less than or equal to `1`")  # noqa: E501
+        if roll is not None and roll < -1:  # noqa: E501
+            raise ValueError("Invalid value for `roll`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._roll = roll
+
+    @property
+    def pitch(self):
+        """Gets the pitch of this MixRequest.  # noqa: E501
+
+        Pitch moment.  # noqa: E501
+
+        :return: The pitch of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._pitch
+
+    @pitch.setter
+    def pitch(self, pitch):
+        """Sets the pitch of this MixRequest.
+
+        Pitch moment.  # noqa: E501
+
+        :param pitch: The pitch of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if pitch is not None and pitch > 1:  # noqa: E501
+            raise ValueError("Invalid value for `pitch`, must be a value less than or equal to `1`")  # noqa: E501
+        if pitch is not None and pitch < -1:  # noqa: E501
+            raise ValueError("Invalid value for `pitch`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._pitch = pitch
+
+    @property
+    def yaw(self):
+        """Gets the yaw of this MixRequest.  # noqa: E501
+
+        Yaw moment.  # noqa: E501
+
+        :return: The yaw of this MixRequest.  # noqa: E501
+        :rtype: float
+        """
+        return self._yaw
+
+    @yaw.setter
+    def yaw(self, yaw):
+        """Sets the yaw of this MixRequest.
+
+        Yaw moment.  # noqa: E501
+
+        :param yaw: The yaw of this MixRequest.  # noqa: E501
+        :type: float
+        """
+        if yaw is not None and yaw > 1:  # noqa: E501
+            raise ValueError("Invalid value for `yaw`, must be a value less than or equal to `1`")  # noqa: E501
+        if yaw is not None and yaw < -1:  # noqa: E501
+            raise ValueError("Invalid value for `yaw`, must be a value greater than or equal to `-1`")  # noqa: E501
+
+        self._yaw = yaw
+
+    def to_dict(self):
+        """Returns the model properties as a dict"""
+        result = {}
+
+        for attr, _ in six.iteritems(self.swagger_types):
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                result[attr] = list(map(
+                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
+                    value
+                ))
+            elif hasattr(value, "to_dict"):
+                result[attr] = value.to_dict()
+            elif isinstance(value, dict):
+                result[attr] = dict(map(
+                    lambda item: (item[0], item[1].to_dict())
+                    if hasattr(item[1], "to_dict") else item,
+                    value.items()
+                ))
+            else:
+                result[attr] = value
+        if issubclass(MixRequest, dict):
+            for key, value in self.items():
+                result[key] = value
+
+        return result
+
+    def to_str(self):
+        """Returns the string representation of the model"""
+        return pprint.pformat(self.to_dict())
+
+    def __repr__(self):
+        """For `print` and `pprint`"""
+        return self.to_str()
+
+    def __eq__(self, other):
+        """Returns true if both objects are equal"""
+        if not isinstance(other, MixRequest):
+            return False
+
+        return all(getattr(self, slot) == getattr(other, slot)
+                   for slot in self.__slots__)
+
+    def __ne__(self, other):
+        """Returns true if both objects are not equal"""
+        return not self == other
+
+
+serializers.register(MixRequest)
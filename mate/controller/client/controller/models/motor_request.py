@@ -15,6 +15,8 @@ import re  # noqa: F401
 
 import six
 
+from controller import serializers
+
 class MotorRequest(object):
     """NOTE: This class is auto generated by the swagger code generator program.
 
@@ -37,6 +39,8 @@ class MotorRequest(object):
         'pwm': 'pwm'
     }
 
+    __slots__ = ('_motorid', '_pwm', 'discriminator')
+
     def __init__(self, motorid=None, pwm=None):  # noqa: E501
         """MotorRequest - a model defined in Swagger"""  # noqa: E501
         self._motorid = None
@@ -133,8 +137,12 @@ class MotorRequest(object):
         if not isinstance(other, MotorRequest):
             return False
 
-        return self.__dict__ == other.__dict__
+        return all(getattr(self, slot) == getattr(other, slot)
+                   for slot in self.__slots__)
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
         return not self == other
+
+
+serializers.register(MotorRequest)
@@ -0,0 +1,140 @@
+# coding: utf-8
+
+"""
+    X Academy ROV controller
+
+    API to control ROV  # noqa: E501
+
+    OpenAPI spec version: 0.7.0
+    
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+import pprint
+import re  # noqa: F401
+
+import six
+
+class MotorsRequest(object):
+    """NOTE: This class is auto generated by the swagger code generator program.
+
+    Do not edit the class manually.
+    """
+    """
+    Attributes:
+      swagger_types (dict): The key is attribute name
+                            and the value is attribute type.
+      attribute_map (dict): The key is attribute name
+                            and the value is json key in definition.
+    """
+    swagger_types = {
+        'motors': 'list[MotorRequest]',
+        'pwm': 'list[int]'
+    }
+
+    attribute_map = {
+        'motors': 'motors',
+        'pwm': 'pwm'
+    }
+
+    def __init__(self, motors=None, pwm=None):  # noqa: E501
+        """MotorsRequest - a model defined in Swagger"""  # noqa: E501
+        self._motors = None
+        self._pwm = None
+        self.discriminator = None
+        if motors is not None:
+            self.motors = motors
+        if pwm is not None:
+            self.pwm = pwm
+
+    @property
+    def motors(self):
+        """Gets the motors of this MotorsRequest.  # noqa: E501
+
+        Motor and PWM value pairs.  # noqa: E501
+
+        :return: The motors of this MotorsRequest.  # noqa: E501
+        :rtype: list[MotorRequest]
+        """
+        return self._motors
+
+    @motors.setter
+    def motors(self, motors):
+        """Sets the motors of this MotorsRequest.
+
+        Motor and PWM value pairs.  # noqa: E501
+
+        :param motors: The motors of this MotorsRequest.  # noqa: E501
+        :type: list[MotorRequest]
+        """
+
+        self._motors = motors
+
+    @property
+    def pwm(self):
+        """Gets the pwm of this MotorsRequest.  # noqa: E501
+
+        PWM value of each motor, indexed by motor id. Null leaves a motor unchanged.  # noqa: E501
+
+        :return: The pwm of this MotorsRequest.  # noqa: E501
+        :rtype: list[int]
+        """
+        return self._pwm
+
+    @pwm.setter
+    def pwm(self, pwm):
+        """Sets the pwm of this MotorsRequest.
+
+        PWM value of each motor, indexed by motor id. Null leaves a motor unchanged.  # noqa: E501
+
+        :param pwm: The pwm of this MotorsRequest.  # noqa: E501
+        :type: list[int]
+        """
+
+        self._pwm = pwm
+
+    def to_dict(self):
+        """Returns the model properties as a dict"""
+        result = {}
+
+        for attr, _ in six.iteritems(self.swagger_types):
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                result[attr] = list(map(
+                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
+                    value
+                ))
+            elif hasattr(value, "to_dict"):
+                result[attr] = value.to_dict()
+            elif isinstance(value, dict):
+                result[attr] = dict(map(
+                    lambda item: (item[0], item[1].to_dict())
+                    if hasattr(item[1], "to_dict") else item,
+                    value.items()
+                ))
+            else:
+                result[attr] = value
+        if issubclass(MotorsRequest, dict):
+            for key, value in self.items():
+                result[key] = value
+
+        return result
+
+    def to_str(self):
+        """Returns the string representation of the model"""
+        return pprint.pformat(self.to_dict())
+
+    def __repr__(self):
+        """For `print` and `pprint`"""
+        return self.to_str()
+
+    def __eq__(self, other):
+        """Returns true if both objects are equal"""
+        if not isinstance(other, MotorsRequest):
+            return False
+
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        """Returns true if both objects are not equal"""
+        return not self == other
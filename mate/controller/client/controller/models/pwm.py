@@ -15,6 +15,8 @@ import re  # noqa: F401
 
 import six
 
+from controller import serializers
+
 class Pwm(object):
     """NOTE: This class is auto generated by the swagger code generator program.
 
@@ -35,6 +37,8 @@ class Pwm(object):
         'value': 'value'
     }
 
+    __slots__ = ('_value', 'discriminator')
+
     def __init__(self, value=None):  # noqa: E501
         """Pwm - a model defined in Swagger"""  # noqa: E501
         self._value = None
@@ -105,8 +109,12 @@ class Pwm(object):
         if not isinstance(other, Pwm):
             return False
 
-        return self.__dict__ == other.__dict__
+        return all(getattr(self, slot) == getattr(other, slot)
+                   for slot in self.__slots__)
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
         return not self == other
+
+
+serializers.register(Pwm)
@@ -0,0 +1,83 @@
+# coding: utf-8
+
+"""
+    X Academy ROV controller
+
+    API to control ROV  # noqa: E501
+
+    OpenAPI spec version: 0.7.0
+
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+from __future__ import absolute_import
+
+import six
+
+# Model class -> function returning the JSON dict of an instance.
+SERIALIZERS = {}
+# Model class -> function returning an instance from a JSON dict.
+DESERIALIZERS = {}
+
+PRIMITIVE_TYPES = {
+    'int': 'int',
+    'long': 'int' if six.PY3 else 'long',
+    'float': 'float',
+    'str': 'str',
+    'bool': 'bool',
+}
+
+
+def _compile(source, name, namespace):
+    code = compile(source, '<{0} serializers>'.format(name), 'exec')
+    exec(code, namespace)
+
+
+def register(klass):
+    """Compiles the serializer and deserializer of a model once, at import.
+
+    Only models whose attributes are all primitive types are compiled.
+    ApiClient falls back to the generic
+    sanitize_for_serialization/__deserialize for the others.
+
+    :param klass: model class with swagger_types and attribute_map,
+        storing each attribute in `_<name>`.
+    :return: klass
+    """
+    if (issubclass(klass, dict) or
+            hasattr(klass, 'get_real_child_model') or
+            any(attr_type not in PRIMITIVE_TYPES
+                for attr_type in six.itervalues(klass.swagger_types))):
+        return klass
+
+    attrs = sorted(klass.swagger_types)
+    lines = ['def serialize(obj):', '    result = {}']
+    for attr in attrs:
+        lines.append('    value = obj._{0}'.format(attr))
+        lines.append('    if value is not None:')
+        lines.append('        result[{0!r}] = value'.format(
+            klass.attribute_map[attr]))
+    lines.append('    return result')
+
+    # Same conversions as ApiClient.__deserialize_primitive.
+    lines.append('def deserialize(data):')
+    for attr in attrs:
+        lines.append('    value = data.get({0!r})'.format(
+            klass.attribute_map[attr]))
+        lines.append('    if value is not None:')
+        lines.append('        try:')
+        lines.append('            value = {0}(value)'.format(
+            PRIMITIVE_TYPES[klass.swagger_types[attr]]))
+        lines.append('        except UnicodeEncodeError:')
+        lines.append('            value = six.text_type(value)')
+        lines.append('        except TypeError:')
+        lines.append('            pass')
+        lines.append('    value_{0} = value'.format(attr))
+    lines.append('    return klass({0})'.format(
+        ', '.join('{0}=value_{0}'.format(attr) for attr in attrs)))
+
+    namespace = {'klass': klass, 'six': six}
+    _compile('\n'.join(lines), klass.__name__, namespace)
+    SERIALIZERS[klass] = namespace['serialize']
+    DESERIALIZERS[klass] = namespace['deserialize']
+    return klass
@@ -28,6 +28,27 @@ class TestDefaultApi(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def test_mix(self):
+        """Test case for mix
+
+        Set all thrusters from a 6-DOF command.  # noqa: E501
+        """
+        calls = []
+
+        def call_api(resource_path, method, *args, **kwargs):
+            calls.append((resource_path, method, kwargs))
+
+        self.api.api_client.call_api = call_api
+        body = controller.MixRequest(surge=0.5, yaw=-0.3)
+        self.api.mix(body)
+        (resource_path, method, kwargs), = calls
+        self.assertEqual((resource_path, method), ('/mix', 'POST'))
+        self.assertIs(kwargs['body'], body)
+        self.assertEqual(
+            self.api.api_client.sanitize_for_serialization(kwargs['body']),
+            {'surge': 0.5, 'yaw': -0.3})
+        self.assertRaises(ValueError, self.api.mix, None)
+
     def test_motor(self):
         """Test case for motor
 
@@ -35,6 +56,29 @@ class TestDefaultApi(unittest.TestCase):
         """
         pass
 
+    def test_set_motors(self):
+        """Test case for set_motors
+
+        Set PWM values for several motors.  # noqa: E501
+        """
+        calls = []
+
+        def call_api(resource_path, method, *args, **kwargs):
+            calls.append((resource_path, method, kwargs))
+
+        self.api.api_client.call_api = call_api
+        body = controller.MotorsRequest(
+            motors=[controller.MotorRequest(motorid=1, pwm=1600)])
+        self.api.set_motors(body)
+        (resource_path, method, kwargs), = calls
+        self.assertEqual((resource_path, method), ('/motors', 'POST'))
+        self.assertIs(kwargs['body'], body)
+        self.assertIsNone(kwargs['response_type'])
+        self.assertEqual(
+            self.api.api_client.sanitize_for_serialization(kwargs['body']),
+            {'motors': [{'motorid': 1, 'pwm': 1600}]})
+        self.assertRaises(ValueError, self.api.set_motors, None)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+# coding: utf-8
+
+"""
+    X Academy ROV controller
+
+    API to control ROV  # noqa: E501
+
+    OpenAPI spec version: 0.7.0
+    
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+import controller
+from controller.models.mix_request import MixRequest  # noqa: E501
+from controller.rest import ApiException
+
+
+class TestMixRequest(unittest.TestCase):
+    """MixRequest unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testMixRequest(self):
+        """Test MixRequest"""
+        model = MixRequest(surge=0.5, yaw=-0.3)
+        self.assertEqual((model.surge, model.yaw), (0.5, -0.3))
+        self.assertIsNone(model.heave)
+        self.assertEqual(model, MixRequest(surge=0.5, yaw=-0.3))
+        self.assertNotEqual(model, MixRequest(surge=0.5))
+        for axis in ('surge', 'sway', 'heave', 'roll', 'pitch', 'yaw'):
+            self.assertRaises(ValueError, MixRequest, **{axis: 1.5})
+            self.assertRaises(ValueError, MixRequest, **{axis: -1.5})
+
+    def testMixRequestSerializers(self):
+        """Test the compiled MixRequest serializers"""
+        api_client = controller.ApiClient()
+        model = MixRequest(surge=0.5, heave=0, yaw=-0.3)
+        data = api_client.sanitize_for_serialization(model)
+        self.assertEqual(data, {'surge': 0.5, 'heave': 0, 'yaw': -0.3})
+        self.assertEqual(
+            api_client._ApiClient__deserialize_model(data, MixRequest), model)
+        self.assertFalse(hasattr(model, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,6 +34,17 @@ class TestMotorRequest(unittest.TestCase):
         # model = controller.models.motor_request.MotorRequest()  # noqa: E501
         pass
 
+    def testMotorRequestSerializers(self):
+        """Test the compiled MotorRequest serializers"""
+        api_client = controller.ApiClient()
+        model = MotorRequest(motorid=3, pwm=1500)
+        data = api_client.sanitize_for_serialization(model)
+        self.assertEqual(data, {'motorid': 3, 'pwm': 1500})
+        self.assertEqual(api_client.sanitize_for_serialization(MotorRequest()), {})
+        self.assertEqual(
+            api_client._ApiClient__deserialize_model(data, MotorRequest), model)
+        self.assertFalse(hasattr(model, '__dict__'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+# coding: utf-8
+
+"""
+    X Academy ROV controller
+
+    API to control ROV  # noqa: E501
+
+    OpenAPI spec version: 0.7.0
+    
+    Generated by: https://github.com/swagger-api/swagger-codegen.git
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+import controller
+from controller.models.motors_request import MotorsRequest  # noqa: E501
+from controller.rest import ApiException
+
+
+class TestMotorsRequest(unittest.TestCase):
+    """MotorsRequest unit test stubs"""
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def testMotorsRequest(self):
+        """Test MotorsRequest"""
+        motors = [controller.MotorRequest(motorid=0, pwm=1500),
+                  controller.MotorRequest(motorid=2, pwm=1700)]
+        model = MotorsRequest(motors=motors)
+        self.assertEqual(model.motors, motors)
+        self.assertIsNone(model.pwm)
+        self.assertEqual(model.to_dict(), {
+            'motors': [{'motorid': 0, 'pwm': 1500},
+                       {'motorid': 2, 'pwm': 1700}],
+            'pwm': None})
+        self.assertEqual(model, MotorsRequest(motors=list(motors)))
+        self.assertNotEqual(model, MotorsRequest(pwm=[1500, None, 1700]))
+
+    def testMotorsRequestSerialization(self):
+        """Test MotorsRequest to and from JSON"""
+        api_client = controller.ApiClient()
+        model = MotorsRequest(pwm=[1500, None, 1700])
+        data = api_client.sanitize_for_serialization(model)
+        self.assertEqual(data, {'pwm': [1500, None, 1700]})
+        self.assertEqual(
+            api_client._ApiClient__deserialize(data, 'MotorsRequest'), model)
+        data = {'motors': [{'motorid': 4, 'pwm': 1200}]}
+        model = api_client._ApiClient__deserialize(data, 'MotorsRequest')
+        self.assertEqual(
+            model.motors, [controller.MotorRequest(motorid=4, pwm=1200)])
+        self.assertEqual(api_client.sanitize_for_serialization(model), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,6 +34,17 @@ class TestPwm(unittest.TestCase):
         # model = controller.models.pwm.Pwm()  # noqa: E501
         pass
 
+    def testPwmSerializers(self):
+        """Test the compiled Pwm serializers"""
+        api_client = controller.ApiClient()
+        model = Pwm(value=1500)
+        data = api_client.sanitize_for_serialization(model)
+        self.assertEqual(data, {'value': 1500})
+        self.assertEqual(api_client.sanitize_for_serialization(Pwm()), {})
+        self.assertEqual(
+            api_client._ApiClient__deserialize_model(data, Pwm), model)
+        self.assertFalse(hasattr(model, '__dict__'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,25 @@
+"""Motor driver backends selectable by name."""
+from mate.drivers.base import MotorDriver, MotorError
+from mate.drivers.null import NullDriver
+from mate.drivers.pca9685 import Pca9685Driver
+from mate.drivers.simulated import SimulatedDriver
+
+DRIVERS = {
+    NullDriver.name: NullDriver,
+    Pca9685Driver.name: Pca9685Driver,
+    SimulatedDriver.name: SimulatedDriver,
+}
+
+
+def get_driver(name, **options):
+    """
+    Create a motor driver.
+    :param name: one of the keys of DRIVERS.
+    :param options: keyword arguments for the driver class.
+    :return: unopened driver instance.
+    """
+    try:
+        driver_class = DRIVERS[name]
+    except KeyError:
+        raise MotorError("Unknown motor driver {}. Choose one of {}.".format(name, ", ".join(sorted(DRIVERS))))
+    return driver_class(**options)
@@ -0,0 +1,53 @@
+"""Interface shared by the motor driver backends."""
+from mate.utils.defaults import NUM_CHANNELS, PWM_FREQUENCY
+
+
+class MotorError(RuntimeError):
+    """Raised when a motor command cannot be carried out."""
+
+
+class MotorDriver(object):
+    """Base class for motor driver backends.
+
+    Drivers work in PCA9685 ticks (0-4095 per PWM period), the conversion from
+    microseconds is done by mate.motors before a driver is called.
+    """
+
+    name = None
+    channels = NUM_CHANNELS
+    # True when writes move real motors.
+    hardware = False
+
+    def __init__(self, frequency=PWM_FREQUENCY):
+        self.frequency = frequency
+
+    def open(self):
+        """Prepare the hardware for use."""
+
+    def close(self):
+        """Release the hardware."""
+
+    def write_channel(self, channel, ticks):
+        """
+        Set the pulse width of one channel.
+        :param channel: PWM channel, 0 based.
+        :param ticks: pulse width in PCA9685 ticks.
+        """
+        raise NotImplementedError
+
+    def write_channels(self, first_channel, ticks):
+        """
+        Set the pulse widths of adjacent channels.
+        :param first_channel: channel of ticks[0].
+        :param ticks: list of pulse widths in PCA9685 ticks.
+        """
+        for offset, value in enumerate(ticks):
+            self.write_channel(first_channel + offset, value)
+
+    def stop_all(self, ticks):
+        """
+        Set every channel to the same pulse width.
+        :param ticks: pulse width in PCA9685 ticks.
+        """
+        for channel in range(self.channels):
+            self.write_channel(channel, ticks)
@@ -0,0 +1,17 @@
+"""Driver that accepts every command and does no I/O."""
+from mate.drivers.base import MotorDriver
+
+
+class NullDriver(MotorDriver):
+    """Discard all writes. Used to benchmark the command path without hardware."""
+
+    name = "null"
+
+    def write_channel(self, channel, ticks):
+        pass
+
+    def write_channels(self, first_channel, ticks):
+        pass
+
+    def stop_all(self, ticks):
+        pass
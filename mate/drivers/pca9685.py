@@ -0,0 +1,108 @@
+"""Driver for the PCA9685 PWM controller on the SparkFun Servo Hat."""
+import time
+
+from mate.drivers.base import MotorDriver, MotorError
+from mate.utils.defaults import (
+    I2C_BUS,
+    PCA9685_ADDRESS,
+    PCA9685_OSCILLATOR,
+    PCA9685_RESOLUTION,
+    PWM_FREQUENCY,
+)
+
+# Register map (see the NXP PCA9685 datasheet, section 7.3).
+MODE1 = 0x00
+MODE2 = 0x01
+LED0_ON_L = 0x06
+ALL_LED_ON_L = 0xFA
+PRE_SCALE = 0xFE
+
+MODE1_AI = 0x20
+MODE1_SLEEP = 0x10
+MODE2_OUTDRV = 0x04
+
+REGISTERS_PER_CHANNEL = 4
+OSCILLATOR_STARTUP = 0.0005
+
+
+def led_register(channel):
+    """Return the LEDn_ON_L register for a channel."""
+    return LED0_ON_L + REGISTERS_PER_CHANNEL * channel
+
+
+def encode_ticks(ticks):
+    """Return the LEDn_ON_L..LEDn_OFF_H bytes for a pulse of ticks starting at count 0."""
+    return [0, 0, ticks & 0xFF, (ticks >> 8) & 0x0F]
+
+
+def prescale_for(frequency):
+    """Return the PRE_SCALE register value for a PWM frequency in Hz."""
+    return int(round(PCA9685_OSCILLATOR / (PCA9685_RESOLUTION * frequency))) - 1
+
+
+class RegisterDriver(MotorDriver):
+    """Driver that programs the PCA9685 register file through write_block()."""
+
+    def open(self):
+        self.write_block(MODE1, [MODE1_SLEEP])
+        self.write_block(PRE_SCALE, [prescale_for(self.frequency)])
+        self.write_block(MODE1, [MODE1_AI])
+        time.sleep(OSCILLATOR_STARTUP)
+        self.write_block(MODE2, [MODE2_OUTDRV])
+
+    def write_channel(self, channel, ticks):
+        self.write_block(led_register(channel), encode_ticks(ticks))
+
+    def write_channels(self, first_channel, ticks):
+        data = []
+        for value in ticks:
+            data.extend(encode_ticks(value))
+        self.write_block(led_register(first_channel), data)
+
+    def stop_all(self, ticks):
+        # The ALL_LED registers set every channel in a single transaction.
+        self.write_block(ALL_LED_ON_L, encode_ticks(ticks))
+
+    def write_block(self, register, data):
+        """
+        Write consecutive registers in one bus transaction (MODE1 auto-increment is on).
+        :param register: first register address.
+        :param data: list of byte values.
+        """
+        raise NotImplementedError
+
+
+class Pca9685Driver(RegisterDriver):
+    """Drive the Servo Hat over I2C with smbus2."""
+
+    name = "pca9685"
+    hardware = True
+
+    def __init__(self, frequency=PWM_FREQUENCY, bus=I2C_BUS, address=PCA9685_ADDRESS):
+        super(Pca9685Driver, self).__init__(frequency)
+        self.bus = bus
+        self.address = address
+        self._smbus = None
+        self._i2c_msg = None
+
+    def open(self):
+        try:
+            from smbus2 import SMBus, i2c_msg
+        except ImportError:
+            raise MotorError("The pca9685 motor driver requires the smbus2 package.")
+        try:
+            self._smbus = SMBus(self.bus)
+        except OSError as err:
+            raise MotorError("Unable to open I2C bus {}: {}".format(self.bus, err))
+        self._i2c_msg = i2c_msg
+        super(Pca9685Driver, self).open()
+
+    def close(self):
+        if self._smbus is not None:
+            self._smbus.close()
+            self._smbus = None
+
+    def write_block(self, register, data):
+        # A plain I2C write is not limited to the 32 byte SMBus block size, so a
+        # whole 16 channel frame goes out as one transaction.
+        self._smbus.i2c_rdwr(self._i2c_msg.write(self.address, [register] + data))
@@ -0,0 +1,28 @@
+"""In-memory model of the PCA9685 register file."""
+from mate.drivers.pca9685 import ALL_LED_ON_L, REGISTERS_PER_CHANNEL, RegisterDriver, led_register
+from mate.utils.defaults import PWM_FREQUENCY
+
+
+class SimulatedDriver(RegisterDriver):
+    """Keep the PCA9685 registers in memory and count bus transactions."""
+
+    name = "simulated"
+
+    def __init__(self, frequency=PWM_FREQUENCY):
+        super(SimulatedDriver, self).__init__(frequency)
+        self.registers = bytearray(256)
+        self.transactions = 0
+
+    def write_block(self, register, data):
+        if register == ALL_LED_ON_L:
+            # Writes to ALL_LED go to every LEDn register, ALL_LED reads back as 0.
+            for channel in range(self.channels):
+                self.registers[led_register(channel):led_register(channel) + REGISTERS_PER_CHANNEL] = bytes(data)
+        else:
+            self.registers[register:register + len(data)] = bytes(data)
+        self.transactions += 1
+
+    def read_channel(self, channel):
+        """Return the pulse width of a channel in ticks."""
+        register = led_register(channel) + 2
+        return self.registers[register] | (self.registers[register + 1] & 0x0F) << 8
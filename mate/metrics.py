@@ -0,0 +1,254 @@
+"""Process wide counters and latency histograms.
+
+Every thread records into its own shard of a metric, so recording needs no lock
+and never contends with other threads. Reading a metric sums the shards. When a
+thread exits its shard is folded into the first shard, so short-lived threads,
+like those of a thread-per-request server, do not pile up shards.
+
+Histograms are log bucketed like HdrHistogram: values below SUB_BUCKETS * 2
+have their own bucket, larger values are bucketed by their top SUB_BITS bits,
+which keeps the relative error of a percentile below 1 / SUB_BUCKETS (about 3%)
+with a fixed number of buckets. Latencies are recorded in nanoseconds from
+time.perf_counter_ns() and reported in microseconds.
+
+Stages of a motor command:
+
+    receive   reading one datagram from the UDP socket
+    decode    decoding one JSON or binary command
+    coalesce  newest submitted value to the coalescer flushing it to the bus
+    queue     publish on the command bus to the write finishing
+    write     writing one frame or stop to the motor driver
+    http      handling one HTTP motor request
+
+    metrics.histogram("decode").record(time.perf_counter_ns() - start)
+    metrics.counter("udp.datagrams").add(count)
+    print(metrics.snapshot())
+"""
+import threading
+import weakref
+
+SUB_BITS = 6
+SUB_BUCKETS = 1 << (SUB_BITS - 1)
+# Values up to 2 ** MAX_BITS nanoseconds (about 18 minutes), larger ones are clamped.
+MAX_BITS = 40
+BUCKETS = (MAX_BITS - SUB_BITS + 2) * SUB_BUCKETS
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+
+def bucket_index(value):
+    """Return the histogram bucket of a non-negative integer value."""
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    return min(shift * SUB_BUCKETS + (value >> shift), BUCKETS - 1)
+
+
+def bucket_value(index):
+    """Return the value in the middle of a histogram bucket."""
+    shift = index // SUB_BUCKETS - 1
+    if shift <= 0:
+        return index
+    return ((index - shift * SUB_BUCKETS) << shift) + (1 << (shift - 1))
+
+
+class _ShardOwner(object):
+    """Kept in thread local storage, so it is collected when its thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded(object):
+    """Base class of metrics with one shard per recording thread."""
+
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()
+        # The first shard holds the values of the threads that exited.
+        self._shards = [self._new_shard()]
+        self._lock = threading.Lock()
+
+    def _new_shard(self):
+        raise NotImplementedError
+
+    def _merge(self, into, shard):
+        raise NotImplementedError
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+            with self._lock:
+                self._shards.append(shard)
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            self._local.shard = shard
+            return shard
+
+    def _retire(self, shard):
+        """Fold the shard of an exited thread into the first shard."""
+        with self._lock:
+            for index in range(1, len(self._shards)):
+                if self._shards[index] is shard:
+                    del self._shards[index]
+                    self._merge(self._shards[0], shard)
+                    break
+
+    def _copy_shards(self):
+        with self._lock:
+            return [list(shard) for shard in self._shards]
+
+    def reset(self):
+        """Forget every recorded value."""
+        with self._lock:
+            # The old thread local storage is released after the lock, its shards are not folded back.
+            local, self._local = self._local, threading.local()
+            self._shards = [self._new_shard()]
+        del local
+
+
+class Counter(_Sharded):
+    """Monotonic counter."""
+
+    def _new_shard(self):
+        return [0]
+
+    def _merge(self, into, shard):
+        into[0] += shard[0]
+
+    def add(self, amount=1):
+        """Add amount to the counter."""
+        self._shard()[0] += amount
+
+    @property
+    def value(self):
+        """Current value of the counter."""
+        return sum(shard[0] for shard in self._copy_shards())
+
+
+class Histogram(_Sharded):
+    """Log bucketed histogram of non-negative integer values, usually nanoseconds."""
+
+    def _new_shard(self):
+        # Bucket counts followed by the count, sum, min and max of the values.
+        return [0] * BUCKETS + [0, 0, None, 0]
+
+    def _merge(self, into, shard):
+        for index in range(BUCKETS + 2):
+            into[index] += shard[index]
+        if shard[BUCKETS + 2] is not None and (into[BUCKETS + 2] is None or shard[BUCKETS + 2] < into[BUCKETS + 2]):
+            into[BUCKETS + 2] = shard[BUCKETS + 2]
+        into[BUCKETS + 3] = max(into[BUCKETS + 3], shard[BUCKETS + 3])
+
+    def record(self, value):
+        """Record one value."""
+        shard = self._shard()
+        value = max(int(value), 0)
+        shard[bucket_index(value)] += 1
+        shard[BUCKETS] += 1
+        shard[BUCKETS + 1] += value
+        if shard[BUCKETS + 2] is None or value < shard[BUCKETS + 2]:
+            shard[BUCKETS + 2] = value
+        if value > shard[BUCKETS + 3]:
+            shard[BUCKETS + 3] = value
+
+    def summary(self, scale=1000.0):
+        """
+        Summarise the recorded values.
+        :param scale: divisor applied to the values, the default reports nanoseconds as microseconds.
+        :return: dict with count, mean, min, max and the PERCENTILES, None when empty.
+        """
+        shards = self._copy_shards()
+        counts = [sum(column) for column in zip(*(shard[:BUCKETS] for shard in shards))]
+        total = sum(shard[BUCKETS] for shard in shards)
+        if not total:
+            return None
+        result = {
+            "count": total,
+            "mean": sum(shard[BUCKETS + 1] for shard in shards) / total / scale,
+            "min": min(shard[BUCKETS + 2] for shard in shards if shard[BUCKETS + 2] is not None) / scale,
+            "max": max(shard[BUCKETS + 3] for shard in shards) / scale,
+        }
+        for label, fraction in PERCENTILES:
+            rank = max(int(fraction * total + 0.5), 1)
+            seen = 0
+            for index, count in enumerate(counts):
+                seen += count
+                if seen >= rank:
+                    result[label] = min(max(bucket_value(index) / scale, result["min"]), result["max"])
+                    break
+        return result
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def _get(name, cls):
+    metric = _metrics.get(name)
+    if metric is None:
+        with _metrics_lock:
+            metric = _metrics.setdefault(name, cls(name))
+    if not isinstance(metric, cls):
+        raise TypeError("Metric {} is a {}.".format(name, type(metric).__name__))
+    return metric
+
+
+def counter(name):
+    """
+    Return the process wide counter called name, creating it on first use.
+    :return: Counter
+    """
+    return _get(name, Counter)
+
+
+def histogram(name):
+    """
+    Return the process wide histogram called name, creating it on first use.
+    :return: Histogram
+    """
+    return _get(name, Histogram)
+
+
+def snapshot():
+    """
+    Return the value of every counter and a summary of every histogram, in microseconds.
+    :return: dict with "counters" and "histograms".
+    """
+    with _metrics_lock:
+        metrics = sorted(_metrics.items())
+    result = {"counters": {}, "histograms": {}}
+    for name, metric in metrics:
+        if isinstance(metric, Counter):
+            result["counters"][name] = metric.value
+        else:
+            summary = metric.summary()
+            if summary is not None:
+                result["histograms"][name] = summary
+    return result
+
+
+def reset():
+    """Forget every recorded value."""
+    with _metrics_lock:
+        metrics = list(_metrics.values())
+    for metric in metrics:
+        metric.reset()
+
+
+def format_snapshot(data):
+    """
+    Format a snapshot() as text.
+    :return: str
+    """
+    lines = []
+    if data["histograms"]:
+        labels = [label for label, _ in PERCENTILES]
+        header = " ".join("{:>9s}".format(label) for label in labels + ["max"])
+        lines.append("{:10s} {:>9s} {}".format("stage (us)", "count", header))
+        for name, summary in sorted(data["histograms"].items()):
+            values = " ".join("{:9.1f}".format(summary[label]) for label in labels + ["max"])
+            lines.append("{:10s} {:9d} {}".format(name, summary["count"], values))
+    for name, value in sorted(data["counters"].items()):
+        lines.append("{:20s} {}".format(name, value))
+    return "\n".join(lines)
@@ -0,0 +1,144 @@
+"""Thruster allocation: 6-DOF commands to motor frames.
+
+A command is a vector of surge, sway, heave, roll, pitch and yaw, each in the
+range -1 to 1. It is multiplied by an allocation matrix with one row per
+thruster, scaled down so no thruster exceeds full thrust, and converted to
+pulse widths around neutral. The whole frame is published to the motor
+command bus (mate.bus) as one frame.
+
+The matrix can be loaded from YAML:
+
+    motors: [0, 1, 2, 3, 4, 5]
+    neutral: 1500
+    span: 400            # microseconds from neutral to full thrust
+    matrix:
+      #  surge sway heave roll pitch yaw
+      - [-1,    1,   0,    0,   0,    1]
+      - ...
+
+The servers mix POST /mix commands with get_mixer(), which loads the file
+named by MATE_MIXER, or uses the default matrix.
+"""
+import os
+import threading
+
+import numpy as np
+from yaml import load
+try:
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader
+
+from mate.bus import publish
+from mate.drivers import MotorError
+from mate.utils.defaults import MIXER_ENV_VAR, NEUTRAL_MICROSECONDS
+
+AXES = ("surge", "sway", "heave", "roll", "pitch", "yaw")
+SPAN_MICROSECONDS = 400
+
+# BlueROV2 style vectored frame: four horizontal thrusters at 45 degrees and
+# two vertical thrusters. Thruster direction is handled by calibration.
+DEFAULT_MATRIX = [
+    [-1, 1, 0, 0, 0, 1],
+    [-1, -1, 0, 0, 0, -1],
+    [1, 1, 0, 0, 0, -1],
+    [1, -1, 0, 0, 0, 1],
+    [0, 0, -1, 1, 0, 0],
+    [0, 0, -1, -1, 0, 0],
+]
+
+
+class Mixer(object):
+    """Convert 6-DOF commands to motor pulse widths with an allocation matrix."""
+
+    def __init__(self, matrix=DEFAULT_MATRIX, motors=None, neutral=NEUTRAL_MICROSECONDS, span=SPAN_MICROSECONDS):
+        """
+        :param matrix: one row of len(AXES) factors per thruster.
+        :param motors: motor number of each row, defaults to 0..rows-1.
+        :param neutral: pulse width for zero thrust.
+        :param span: microseconds from neutral to full thrust.
+        """
+        self.matrix = np.array(matrix, dtype=np.float64)
+        if self.matrix.ndim != 2 or self.matrix.shape[1] != len(AXES):
+            raise MotorError("Allocation matrix needs {} columns ({}).".format(len(AXES), ", ".join(AXES)))
+        self.motors = list(range(len(self.matrix))) if motors is None else list(motors)
+        if len(self.motors) != len(self.matrix):
+            raise MotorError("Allocation matrix has {} rows for {} motors.".format(len(self.matrix), len(self.motors)))
+        self.neutral = neutral
+        self.span = span
+
+    @classmethod
+    def from_yaml(cls, filename):
+        """
+        Create a mixer from a YAML file.
+        :param filename: path of the YAML file.
+        :return: Mixer
+        """
+        try:
+            with open(filename) as mixer_file:
+                settings = load(mixer_file, Loader=Loader) or {}
+        except OSError as err:
+            raise MotorError("Unable to read mixer file {}: {}".format(filename, err))
+        return cls(
+            settings.get("matrix", DEFAULT_MATRIX),
+            motors=settings.get("motors"),
+            neutral=settings.get("neutral", NEUTRAL_MICROSECONDS),
+            span=settings.get("span", SPAN_MICROSECONDS),
+        )
+
+    def thrust(self, command):
+        """
+        Return the thrust of each thruster, -1 to 1.
+        :param command: len(AXES) vector, or an array of such vectors.
+        :return: numpy array with one value per thruster (per command).
+        """
+        command = np.clip(np.asarray(command, dtype=np.float64), -1.0, 1.0)
+        thrust = command @ self.matrix.T
+        # Scale all thrusters together so the largest is at most full thrust,
+        # which keeps the direction of the command.
+        peak = np.max(np.abs(thrust), axis=-1, keepdims=True)
+        return thrust / np.maximum(peak, 1.0)
+
+    def pulse_widths(self, command):
+        """
+        Return the pulse width of each thruster in microseconds.
+        :param command: len(AXES) vector, or an array of such vectors.
+        :return: numpy int array with one value per thruster (per command).
+        """
+        return np.rint(self.neutral + self.span * self.thrust(command)).astype(np.int64)
+
+    def frame(self, command):
+        """
+        Return the motor frame for one command.
+        :param command: len(AXES) vector.
+        :return: dict of motor to microseconds.
+        """
+        return dict(zip(self.motors, self.pulse_widths(command).tolist()))
+
+    def apply(self, command, write=publish):
+        """
+        Publish the motor frame for one command, written in a single bulk write.
+        :param command: len(AXES) vector.
+        :param write: function called with the frame.
+        :return: dict of motor to microseconds.
+        """
+        frame = self.frame(command)
+        write(frame)
+        return frame
+
+
+_mixer = None
+_mixer_lock = threading.Lock()
+
+
+def get_mixer():
+    """
+    Return the mixer of this process, loaded from $MATE_MIXER on first use.
+    :return: Mixer, with the default matrix when MATE_MIXER is not set.
+    """
+    global _mixer
+    with _mixer_lock:
+        if _mixer is None:
+            filename = os.environ.get(MIXER_ENV_VAR)
+            _mixer = Mixer.from_yaml(filename) if filename else Mixer()
+        return _mixer
@@ -1,11 +1,215 @@
+"""Motor control for the SparkFun Servo Hat.
+
+Commands are given in microseconds, converted to PCA9685 ticks and passed to
+the configured driver backend (see mate.drivers). The backend is chosen with
+configure() or the MATE_MOTOR_DRIVER environment variable, the per-motor
+calibration (see mate.calibration) with configure() or MATE_CALIBRATION.
+
+The last value written to each channel is kept in shadow registers. A command
+that maps to the ticks already on a channel is not sent to the driver, and
+get_motor_status() answers from the shadow copy without touching hardware.
+"""
+import logging
+import math
+import numbers
+import os
+import threading
+import time
+
+from mate import metrics
+from mate.calibration import Calibration, load_settings
+from mate.drivers import MotorError, get_driver
+from mate.utils.defaults import (
+    CALIBRATION_ENV_VAR,
+    DEFAULT_DRIVER,
+    DRIVER_ENV_VAR,
+    NUM_CHANNELS,
+)
+
+logger = logging.getLogger("mate")
+
+_lock = threading.RLock()
+_driver = None
+_driver_name = None
+_driver_options = {}
+_calibration_settings = None
+_calibration = None
+_shadow = None
+_write_latency = metrics.histogram("write")
+
+
+class ShadowRegisters(object):
+    """Last value written to each channel, with hit/miss counters for skipped writes."""
+
+    def __init__(self, channels):
+        self.microseconds = [None] * channels
+        self.ticks = [None] * channels
+        self.hits = 0
+        self.misses = 0
+
+    def is_current(self, channel, microseconds, ticks):
+        """
+        Check whether a channel already holds ticks, counting a hit or a miss.
+        :return: True when the write can be skipped.
+        """
+        if self.ticks[channel] == ticks:
+            self.microseconds[channel] = microseconds
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def store(self, channel, microseconds, ticks):
+        """Record a value that has been written to a channel."""
+        self.microseconds[channel] = microseconds
+        self.ticks[channel] = ticks
+
+
+def configure(driver=None, calibration=None, **options):
+    """
+    Select the motor driver backend. The driver is opened on the next motor command.
+    :param driver: driver name, defaults to $MATE_MOTOR_DRIVER or DEFAULT_DRIVER.
+    :param calibration: calibration settings dict or YAML filename, defaults to
+        $MATE_CALIBRATION or no calibration.
+    :param options: keyword arguments for the driver class.
+    """
+    global _driver, _driver_name, _driver_options, _calibration_settings, _calibration, _shadow
+    with _lock:
+        if _driver is not None:
+            _driver.close()
+        _driver = None
+        _calibration = None
+        _shadow = None
+        _driver_name = driver
+        _driver_options = options
+        _calibration_settings = calibration
+
+
+def get_motor_driver():
+    """
+    Return the open motor driver, creating it on first use.
+    :return: MotorDriver
+    """
+    global _driver, _calibration, _shadow
+    with _lock:
+        if _driver is None:
+            name = _driver_name or os.environ.get(DRIVER_ENV_VAR, DEFAULT_DRIVER)
+            driver = get_driver(name, **_driver_options)
+            settings = _calibration_settings or os.environ.get(CALIBRATION_ENV_VAR) or {}
+            if not isinstance(settings, dict):
+                settings = load_settings(settings)
+            calibration = Calibration(settings, driver.channels, driver.frequency)
+            driver.open()
+            logger.debug("Opened {} motor driver.".format(name))
+            _calibration = calibration
+            _shadow = ShadowRegisters(driver.channels)
+            _driver = driver
+        return _driver
+
+
+def get_calibration():
+    """
+    Return the compiled calibration of the open driver.
+    :return: mate.calibration.Calibration
+    """
+    with _lock:
+        get_motor_driver()
+        return _calibration
+
+
+def _check_motor(driver, motor):
+    if not 0 <= motor < driver.channels:
+        raise MotorError("Motor {} is out of range 0-{}.".format(motor, driver.channels - 1))
+
+
+def check_frame(frame, channels=NUM_CHANNELS):
+    """
+    Check a frame before it is queued, so a bad command is refused on its own instead
+    of failing the write it would be merged into.
+    :param frame: dict of motor to microseconds.
+    :param channels: number of motors.
+    :raise MotorError: for a motor out of range or a pulse width that is not a number.
+    """
+    for motor, microseconds in frame.items():
+        if not isinstance(motor, numbers.Integral) or not 0 <= motor < channels:
+            raise MotorError("Motor {!r} is out of range 0-{}.".format(motor, channels - 1))
+        if (
+            isinstance(microseconds, bool)
+            or not isinstance(microseconds, numbers.Real)
+            or not math.isfinite(microseconds)
+        ):
+            raise MotorError("Pulse width {!r} for motor {} is not a number.".format(microseconds, motor))
+
+
+def frame_items(frame):
+    """
+    Return the (motor, microseconds) pairs of a frame sorted by motor.
+    :param frame: mapping of motor to microseconds, or a sequence indexed by motor
+        where None leaves that motor unchanged.
+    :return: list of (motor, microseconds)
+    """
+    if hasattr(frame, "items"):
+        items = frame.items()
+    else:
+        items = enumerate(frame)
+    return sorted((int(motor), microseconds) for motor, microseconds in items if microseconds is not None)
+
+
 def set_motor(motor, microseconds):
     """
     Set PWM value for motor
-    :param motor:
-    :param microseconds:
+    :param motor: motor number, which is also the Servo Hat channel.
+    :param microseconds: pulse width.
     :return:
     """
-    print("Setting motor {} to microseconds {}.".format(motor, microseconds))
+    with _lock:
+        driver = get_motor_driver()
+        _check_motor(driver, motor)
+        ticks = _calibration.ticks(motor, microseconds)
+        if _shadow.is_current(motor, microseconds, ticks):
+            return
+        logger.debug("Setting motor %s to microseconds %s.", motor, microseconds)
+        start = time.perf_counter_ns()
+        driver.write_channel(motor, ticks)
+        _write_latency.record(time.perf_counter_ns() - start)
+        _shadow.store(motor, microseconds, ticks)
+
+
+def set_motors(frame):
+    """
+    Set PWM values for several motors. Adjacent channels are written in a single
+    auto-increment register burst, so a full frame is one bus transaction.
+    :param frame: mapping of motor to microseconds, or a sequence indexed by motor.
+    :return:
+    """
+    items = frame_items(frame)
+    with _lock:
+        driver = get_motor_driver()
+        for motor, _ in items:
+            _check_motor(driver, motor)
+        changed = []
+        for motor, microseconds in items:
+            ticks = _calibration.ticks(motor, microseconds)
+            if not _shadow.is_current(motor, microseconds, ticks):
+                changed.append((motor, microseconds, ticks))
+        if not changed:
+            return
+        logger.debug("Setting motors %s.", changed)
+        start = time.perf_counter_ns()
+        run = []
+        for change in changed:
+            if run and change[0] != run[0][0] + len(run):
+                _write_run(driver, run)
+                run = []
+            run.append(change)
+        _write_run(driver, run)
+        _write_latency.record(time.perf_counter_ns() - start)
+
+
+def _write_run(driver, run):
+    driver.write_channels(run[0][0], [ticks for _, _, ticks in run])
+    for motor, microseconds, ticks in run:
+        _shadow.store(motor, microseconds, ticks)
 
 
 def stop_all_motors():
@@ -13,8 +217,41 @@ def stop_all_motors():
     Stop all motors.
 
     """
-    print("Stopping all motors.")
+    with _lock:
+        driver = get_motor_driver()
+        logger.debug("Stopping all motors.")
+        neutral_ticks = _calibration.neutral_ticks
+        start = time.perf_counter_ns()
+        if len(set(neutral_ticks)) == 1:
+            driver.stop_all(neutral_ticks[0])
+        else:
+            driver.write_channels(0, neutral_ticks)
+        _write_latency.record(time.perf_counter_ns() - start)
+        for channel, ticks in enumerate(neutral_ticks):
+            _shadow.store(channel, _calibration.neutral_microseconds[channel], ticks)
 
 
+def get_motor_status():
+    """
+    Return the last value written to each motor from the shadow registers.
+    :return: list of dicts with motorid, pwm (microseconds) and ticks.
+    """
+    with _lock:
+        if _shadow is None:
+            return []
+        return [
+            {"motorid": channel, "pwm": microseconds, "ticks": ticks}
+            for channel, (microseconds, ticks) in enumerate(zip(_shadow.microseconds, _shadow.ticks))
+            if ticks is not None
+        ]
 
 
+def get_cache_stats():
+    """
+    Return the shadow register counters.
+    :return: dict with hits (writes skipped) and misses (writes sent).
+    """
+    with _lock:
+        if _shadow is None:
+            return {"hits": 0, "misses": 0}
+        return {"hits": _shadow.hits, "misses": _shadow.misses}
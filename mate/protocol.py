@@ -0,0 +1,366 @@
+"""Motor command messages shared by the HTTP and UDP frontends.
+
+A command is decoded into a frame: a dict of motor to microseconds that can be
+passed to mate.motors.set_motors(). Accepted JSON shapes:
+
+    {"motorid": 1, "pwm": 1500}                       one motor
+    {"motors": [{"motorid": 1, "pwm": 1500}, ...]}    several motors
+    {"pwm": [1500, 1500, ...]}                        dense vector indexed by motor
+
+Any JSON command can carry "seq" (sender sequence number) and "ts" (sender time
+in microseconds since the epoch), which every binary command has, and "trace"
+(trace id, see mate.trace).
+
+The binary format is a fixed little-endian layout, version 1:
+
+    magic      2 bytes   b"MT"
+    version    uint8     1
+    count      uint8     number of motors N, at most MAX_MOTORS
+    sequence   uint32    sender sequence number
+    timestamp  uint64    sender time in microseconds since the epoch
+    N times:
+      motor    uint8
+      pwm      uint16    microseconds
+
+Version 2 is a traced command: the header is followed by
+
+    trace      uint32    trace id
+
+and then the motors. Commands without a trace id are sent as version 1.
+
+decode() accepts both formats; JSON always starts with "{", binary with the magic.
+
+Sequence numbers are uint32 and compared with serial number arithmetic, so they
+may wrap around. SequenceTracker uses them to drop stale commands.
+
+Senders of sequenced commands get cumulative acknowledgements, version 1:
+
+    magic      2 bytes   b"MA"
+    version    uint8     ACK_VERSION
+    pad        1 byte
+    sequence   uint32    highest sequence number received from the sender
+    history    uint64    bit i set when sequence - 1 - i was received
+    timestamp  uint64    timestamp of the command with the highest sequence number
+"""
+import json
+import struct
+import time
+from collections import namedtuple
+
+from mate.utils.defaults import NUM_CHANNELS
+
+MAGIC = b"MT"
+VERSION = 1
+TRACE_VERSION = 2
+MAX_MOTORS = NUM_CHANNELS
+HEADER_FORMAT = "<2sBBIQ"
+TRACE_FORMAT = "I"
+ENTRY_FORMAT = "BH"
+SEQUENCE_MASK = 0xFFFFFFFF
+HEADER = struct.Struct(HEADER_FORMAT)
+# One precompiled struct per version and motor count, so a whole frame is one unpack_from.
+FRAME_STRUCTS = [struct.Struct(HEADER_FORMAT + ENTRY_FORMAT * count) for count in range(MAX_MOTORS + 1)]
+TRACED_FRAME_STRUCTS = [
+    struct.Struct(HEADER_FORMAT + TRACE_FORMAT + ENTRY_FORMAT * count) for count in range(MAX_MOTORS + 1)
+]
+
+ACK_MAGIC = b"MA"
+ACK_VERSION = 1
+ACK = struct.Struct("<2sBxIQQ")
+ACK_HISTORY = 64
+HISTORY_MASK = (1 << ACK_HISTORY) - 1
+
+Message = namedtuple("Message", "frame sequence timestamp trace")
+Ack = namedtuple("Ack", "sequence history timestamp")
+
+
+class ProtocolError(ValueError):
+    """Raised when a motor command message cannot be decoded."""
+
+
+def frame_from_json(data):
+    """
+    Convert a decoded JSON command to a frame.
+    :param data: dict in one of the accepted shapes.
+    :return: dict of motor to microseconds.
+    """
+    try:
+        if "motors" in data:
+            return {int(item["motorid"]): int(item["pwm"]) for item in data["motors"]}
+        if isinstance(data["pwm"], list):
+            return {motor: int(pwm) for motor, pwm in enumerate(data["pwm"]) if pwm is not None}
+        return {int(data["motorid"]): int(data["pwm"])}
+    except (KeyError, TypeError, ValueError) as err:
+        raise ProtocolError("Invalid motor command {!r}: {}".format(data, err))
+
+
+def trace_from_json(data):
+    """
+    Return the trace id and send timestamp of a decoded JSON command as integers.
+    :param data: dict in one of the accepted shapes.
+    :return: (trace, timestamp), each None when the command has none.
+    """
+    try:
+        trace = None if data.get("trace") is None else int(data["trace"])
+        timestamp = None if data.get("ts") is None else int(data["ts"])
+    except (TypeError, ValueError) as err:
+        raise ProtocolError("Invalid motor command {!r}: {}".format(data, err))
+    return trace, timestamp
+
+
+def _load_json(message):
+    try:
+        return json.loads(message)
+    except ValueError as err:
+        raise ProtocolError("Invalid JSON motor command: {}".format(err))
+
+
+def decode_json(message):
+    """
+    Decode a JSON motor command.
+    :param message: bytes or str.
+    :return: dict of motor to microseconds.
+    """
+    return frame_from_json(_load_json(message))
+
+
+def encode_json(frame):
+    """
+    Encode a frame as a JSON motor command.
+    :param frame: dict of motor to microseconds.
+    :return: bytes
+    """
+    motors = [{"motorid": motor, "pwm": pwm} for motor, pwm in sorted(frame.items())]
+    return json.dumps({"motors": motors}).encode("utf-8")
+
+
+def timestamp_now():
+    """Return the current time in microseconds since the epoch."""
+    return time.time_ns() // 1000
+
+
+def binary_size(count, traced=False):
+    """Return the size in bytes of a binary command for count motors."""
+    return (TRACED_FRAME_STRUCTS if traced else FRAME_STRUCTS)[count].size
+
+
+def pack_binary_into(buffer, offset, frame, sequence, timestamp=None, trace=None):
+    """
+    Encode a frame as a binary command into a preallocated buffer.
+    :param buffer: writable buffer, at least binary_size(len(frame), trace is not None) bytes from offset.
+    :param offset: position of the command in buffer.
+    :param frame: dict of motor to microseconds.
+    :param sequence: sender sequence number.
+    :param timestamp: microseconds since the epoch, defaults to now.
+    :param trace: trace id, the command is sent as version 2 when given.
+    :return: number of bytes written.
+    """
+    if len(frame) > MAX_MOTORS:
+        raise ProtocolError("A binary command holds at most {} motors.".format(MAX_MOTORS))
+    timestamp = timestamp_now() if timestamp is None else timestamp
+    if trace is None:
+        values = [MAGIC, VERSION, len(frame), sequence & SEQUENCE_MASK, timestamp]
+        frame_struct = FRAME_STRUCTS[len(frame)]
+    else:
+        values = [MAGIC, TRACE_VERSION, len(frame), sequence & SEQUENCE_MASK, timestamp, trace]
+        frame_struct = TRACED_FRAME_STRUCTS[len(frame)]
+    for motor, pwm in frame.items():
+        values.append(motor)
+        values.append(pwm)
+    try:
+        frame_struct.pack_into(buffer, offset, *values)
+    except struct.error as err:
+        raise ProtocolError("Invalid motor command {!r}: {}".format(frame, err))
+    return frame_struct.size
+
+
+def encode_binary(frame, sequence, timestamp=None, trace=None):
+    """
+    Encode a frame as a binary command.
+    :param frame: dict of motor to microseconds.
+    :param sequence: sender sequence number.
+    :param timestamp: microseconds since the epoch, defaults to now.
+    :param trace: trace id, the command is sent as version 2 when given.
+    :return: bytes
+    """
+    buffer = bytearray(binary_size(min(len(frame), MAX_MOTORS), trace is not None))
+    pack_binary_into(buffer, 0, frame, sequence, timestamp, trace)
+    return bytes(buffer)
+
+
+def decode_binary(message):
+    """
+    Decode a binary command.
+    :param message: bytes, bytearray or memoryview.
+    :return: Message
+    """
+    view = memoryview(message)
+    if len(view) < HEADER.size or view[0:2] != MAGIC:
+        raise ProtocolError("Not a binary motor command.")
+    count = view[3]
+    if count > MAX_MOTORS:
+        raise ProtocolError("Truncated or oversized binary motor command.")
+    if view[2] == VERSION:
+        frame_struct = FRAME_STRUCTS[count]
+    elif view[2] == TRACE_VERSION:
+        frame_struct = TRACED_FRAME_STRUCTS[count]
+    else:
+        raise ProtocolError("Unsupported binary motor command version {}.".format(view[2]))
+    if len(view) < frame_struct.size:
+        raise ProtocolError("Truncated or oversized binary motor command.")
+    values = frame_struct.unpack_from(view)
+    if view[2] == VERSION:
+        return Message(dict(zip(values[5::2], values[6::2])), values[3], values[4], None)
+    return Message(dict(zip(values[6::2], values[7::2])), values[3], values[4], values[5])
+
+
+def decode(message):
+    """
+    Decode a JSON or binary command.
+    :param message: bytes, bytearray or memoryview.
+    :return: Message, sequence, timestamp and trace are None for JSON commands without them.
+    """
+    if message[:1] == b"{":
+        data = _load_json(bytes(message))
+        frame = frame_from_json(data)
+        trace, timestamp = trace_from_json(data)
+        try:
+            sequence = None if data.get("seq") is None else int(data["seq"]) & SEQUENCE_MASK
+        except (TypeError, ValueError) as err:
+            raise ProtocolError("Invalid motor command {!r}: {}".format(data, err))
+        return Message(frame, sequence, timestamp, trace)
+    return decode_binary(message)
+
+
+def encode_ack(sequence, history, timestamp=None):
+    """
+    Encode a cumulative acknowledgement.
+    :param sequence: highest sequence number received.
+    :param history: bitmap of the ACK_HISTORY sequence numbers before it.
+    :param timestamp: timestamp of the command with the highest sequence number.
+    :return: bytes
+    """
+    return ACK.pack(ACK_MAGIC, ACK_VERSION, sequence, history, timestamp or 0)
+
+
+def decode_ack(message):
+    """
+    Decode a cumulative acknowledgement.
+    :param message: bytes, bytearray or memoryview.
+    :return: Ack
+    """
+    if len(message) < ACK.size or message[:2] != ACK_MAGIC:
+        raise ProtocolError("Not a motor command acknowledgement.")
+    _, version, sequence, history, timestamp = ACK.unpack_from(message)
+    if version != ACK_VERSION:
+        raise ProtocolError("Unsupported acknowledgement version {}.".format(version))
+    return Ack(sequence, history, timestamp)
+
+
+def sequence_newer(sequence, other):
+    """Return True when sequence is later than other, allowing for wrap around."""
+    return 0 < (sequence - other) & SEQUENCE_MASK < 0x80000000
+
+
+class SequenceTracker(object):
+    """Track sequence numbers per sender and the last command applied to each motor.
+
+    Counters:
+      stale      motor values dropped because a later one from the same sender was applied
+      reordered  commands that arrived after a later command from the same sender
+      gaps       sequence numbers skipped and not (yet) received
+      too_old    commands more than ACK_HISTORY behind the highest from the same sender
+
+    Call evict() now and then to forget senders that went quiet.
+    """
+
+    def __init__(self):
+        self.highest = {}
+        self.history = {}
+        self.timestamps = {}
+        self.seen = {}
+        self.applied = {}
+        self.stale = 0
+        self.reordered = 0
+        self.gaps = 0
+        self.too_old = 0
+
+    def observe(self, sender, sequence, timestamp=None):
+        """
+        Record a received command for acknowledgement and count reorders and gaps.
+        :param sender: sender address.
+        :param sequence: sequence number of the command.
+        :param timestamp: timestamp of the command, echoed in acknowledgements.
+        """
+        self.seen[sender] = time.monotonic()
+        highest = self.highest.get(sender)
+        if highest is None:
+            self.highest[sender] = sequence
+            self.history[sender] = 0
+            self.timestamps[sender] = timestamp
+            return
+        distance = (sequence - highest) & SEQUENCE_MASK
+        if sequence_newer(sequence, highest):
+            self.gaps += distance - 1
+            history = self.history[sender]
+            self.history[sender] = ((history << distance) | (1 << (distance - 1))) & HISTORY_MASK if distance <= ACK_HISTORY else 0
+            self.highest[sender] = sequence
+            self.timestamps[sender] = timestamp
+        elif sequence != highest:
+            distance = (highest - sequence) & SEQUENCE_MASK
+            if distance > ACK_HISTORY:
+                # Outside the history, so it cannot be told apart from a duplicate.
+                self.too_old += 1
+                return
+            bit = 1 << (distance - 1)
+            if not self.history[sender] & bit:
+                self.history[sender] |= bit
+                self.reordered += 1
+                self.gaps = max(self.gaps - 1, 0)
+
+    def evict(self, max_idle):
+        """
+        Forget the senders without a command for max_idle seconds.
+        :param max_idle: seconds.
+        :return: list of the senders forgotten.
+        """
+        deadline = time.monotonic() - max_idle
+        idle = [sender for sender, seen in self.seen.items() if seen < deadline]
+        for sender in idle:
+            del self.seen[sender], self.highest[sender], self.history[sender], self.timestamps[sender]
+        if idle:
+            gone = set(idle)
+            for motor in [motor for motor, (sender, _) in self.applied.items() if sender in gone]:
+                del self.applied[motor]
+        return idle
+
+    def ack(self, sender):
+        """
+        Return the cumulative acknowledgement for a sender.
+        :return: bytes
+        """
+        return encode_ack(self.highest[sender], self.history[sender], self.timestamps[sender])
+
+    def accept(self, motor, sender, sequence, pending):
+        """
+        Check that a command is later than the last one applied, or pending, for a motor
+        from the same sender. Commands without a sequence number are always accepted.
+        Accepted values are added to pending, call record() once they have been queued.
+        :param pending: dict of motor to (sender, sequence) of the values accepted so far.
+        :return: True when the motor value should be applied.
+        """
+        if sequence is not None:
+            last = pending.get(motor) or self.applied.get(motor)
+            if (last is not None and last[0] == sender and last[1] is not None
+                    and not sequence_newer(sequence, last[1])):
+                self.stale += 1
+                return False
+        pending[motor] = (sender, sequence)
+        return True
+
+    def record(self, pending):
+        """
+        Record accepted values as applied, so older ones from the same sender are dropped.
+        :param pending: dict filled by accept().
+        """
+        self.applied.update(pending)
@@ -0,0 +1,135 @@
+"""Slew-rate limited ramping of motor pulse widths.
+
+Sudden steps in pulse width can brown out the ESC supply. The ramp engine
+holds a target and a current pulse width for every channel in NumPy arrays
+and, on each control tick, moves all channels towards their targets by at
+most their slew limit in one vectorised step. A client sends one command per
+target change and the engine writes the intermediate values.
+
+The servers use the engine in place of the coalescer with 'mate serve-udp
+--ramp' and 'mate serve-http --ramp': received commands become targets, and the
+slew limits come from the "slew" calibration setting.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+
+from mate import trace
+from mate.bus import get_bus
+from mate.motors import check_frame, get_calibration
+from mate.utils.defaults import FLUSH_RATE
+
+logger = logging.getLogger("mate")
+
+
+class RampEngine(object):
+    """Move every channel towards its target at a limited slew rate."""
+
+    def __init__(self, slew=None, rate=FLUSH_RATE, bus=None, neutral=None):
+        """
+        :param slew: microseconds per second, one value or one per channel. 0 is
+            no limit. Defaults to the slew settings of the calibration.
+        :param rate: control ticks per second.
+        :param bus: CommandBus, defaults to the process wide bus.
+        :param neutral: starting pulse width per channel, defaults to the
+            calibrated neutral.
+        """
+        if slew is None or neutral is None:
+            calibration = get_calibration()
+            slew = calibration.slew if slew is None else slew
+            neutral = calibration.neutral_microseconds if neutral is None else neutral
+        self.period = 1.0 / rate
+        self.neutral = np.array(neutral, dtype=np.float64)
+        self.channels = len(self.neutral)
+        slew = np.broadcast_to(np.asarray(slew, dtype=np.float64), self.neutral.shape)
+        self.max_step = np.where(slew > 0, slew * self.period, np.inf)
+        self.current = self.neutral.copy()
+        self.target = self.neutral.copy()
+        self.bus = bus or get_bus()
+        self._generation = self.bus.generation
+        self._lock = threading.Lock()
+        self._moving = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.steps = 0
+
+    def submit(self, frame, traces=None):
+        """
+        Set new targets.
+        :param frame: dict of motor to microseconds.
+        :param traces: trace records of the commands in frame, they end when the targets are set.
+        """
+        check_frame(frame, self.channels)
+        with self._lock:
+            self._check_stopped()
+            for motor, microseconds in frame.items():
+                self.target[motor] = microseconds
+        trace.mark(traces, "published")
+        self._moving.set()
+
+    def set_motor(self, motor, microseconds):
+        """Set a new target for one motor."""
+        self.submit({motor: microseconds})
+
+    def step(self):
+        """
+        Advance every channel by one control tick and write the channels that moved.
+        :return: dict of motor to microseconds written, empty when all channels are on target.
+        """
+        with self._lock:
+            self._check_stopped()
+            delta = np.clip(self.target - self.current, -self.max_step, self.max_step)
+            moved = np.flatnonzero(delta)
+            if not len(moved):
+                self._moving.clear()
+                return {}
+            self.current += delta
+            frame = dict(zip(moved.tolist(), np.rint(self.current[moved]).astype(np.int64).tolist()))
+            self.steps += 1
+            generation = self._generation
+        self.bus.publish(frame, generation=generation)
+        return frame
+
+    def _check_stopped(self):
+        """Reset every channel to neutral if the motors were stopped through the bus."""
+        if self._generation != self.bus.generation:
+            self._generation = self.bus.generation
+            self.current[:] = self.neutral
+            self.target[:] = self.neutral
+
+    def halt(self):
+        """Stop all motors at once, without ramping, and reset all targets to neutral."""
+        self.bus.publish_stop()
+        with self._lock:
+            self._check_stopped()
+
+    def start(self):
+        """Start the control tick thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="mate-ramp", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the control tick thread, leaving the motors where they are."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._moving.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._moving.wait()
+            if self._stopped.is_set():
+                return
+            started = time.monotonic()
+            try:
+                self.step()
+            except RuntimeError:
+                logger.exception("Problem writing ramped motor commands.")
+            delay = self.period - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
@@ -0,0 +1,60 @@
+"""Handlers for the operations in controller.yaml.
+
+Commands go to the motor owner of the process (see mate.server.owner).
+"""
+from mate.mixer import AXES
+from mate.motors import MotorError
+from mate.protocol import ProtocolError, frame_from_json
+from mate.server.owner import get_owner
+
+owner = get_owner()
+
+
+def get_motor():
+    """
+    Get motor status from the shadow registers, the hardware is not read.
+    :return: dict with the last value of each motor and the cache counters.
+    """
+    try:
+        return owner.status()
+    except MotorError as err:
+        return {"message": str(err)}, 503
+
+
+def motor(body):
+    """
+    Set PWM value for motor. The value is written by the coalescer thread.
+    :param body: motor_request dict.
+    """
+    try:
+        owner.set_motor(body["motorid"], body["pwm"])
+    except MotorError as err:
+        return {"message": str(err)}, 400
+    return {"message": "success"}
+
+
+def motors(body):
+    """
+    Set PWM values for several motors. The values are queued together, so they are
+    written in one bulk write by the coalescer thread.
+    :param body: motors_request dict.
+    """
+    try:
+        owner.submit(frame_from_json(body))
+    except (ProtocolError, MotorError) as err:
+        return {"message": str(err)}, 400
+    return {"message": "success"}
+
+
+def mix(body):
+    """
+    Set all thrusters from a 6-DOF command, mixed with the allocation matrix of
+    the server (see mate.mixer). The frame is queued like POST /motors.
+    :param body: mix_request dict, axes that are left out are 0.
+    :return: dict with the pulse width set for each thruster.
+    """
+    try:
+        frame = owner.mix([body.get(axis, 0.0) for axis in AXES])
+    except MotorError as err:
+        return {"message": str(err)}, 400
+    return {"message": "success", "motors": [{"motorid": motor, "pwm": pwm} for motor, pwm in sorted(frame.items())]}
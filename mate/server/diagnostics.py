@@ -0,0 +1,32 @@
+"""Metrics and trace records of the HTTP server, for 'mate stats' and 'mate trace dump' with --url:
+
+    GET /stats            mate.metrics.snapshot()
+    GET /trace?last=N     the last N records of mate.trace
+
+The answers are the same as those of the status endpoint of the UDP motor server
+(see mate.server.status). With 'mate serve-http --workers N' each request is
+answered by one worker with the metrics of that worker, the motors are written
+by the owner, whose status endpoint reports its own stages.
+"""
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from mate import metrics, trace
+
+
+async def stats(request):
+    """Return the counters and latency histograms of this process."""
+    return JSONResponse(metrics.snapshot())
+
+
+async def trace_records(request):
+    """Return the last trace records of this process, all of them without last."""
+    last = request.query_params.get("last")
+    try:
+        last = None if last is None else int(last)
+    except ValueError:
+        return JSONResponse({"message": "last must be an integer."}, status_code=400)
+    return JSONResponse(trace.records(last))
+
+
+routes = [Route("/stats", stats, methods=["GET"]), Route("/trace", trace_records, methods=["GET"])]
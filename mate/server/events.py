@@ -0,0 +1,120 @@
+"""Server-Sent Events telemetry stream, the streaming variant of GET /motor.
+
+GET /motor/events?interval=SECONDS keeps the response open and pushes events
+instead of being polled. Every interval the server compares the current state
+with what it last sent to that client and only sends what changed:
+
+    event: motors   {"motors": [{"motorid", "pwm", "ticks"}, ...]}
+                    channels whose value changed, all channels in the first event
+    event: stats    {"rates": {counter: per second}, "latency": {stage: summary}}
+                    only while commands are arriving
+
+Idle channels and an idle server send nothing but a comment every
+KEEPALIVE_INTERVAL seconds so proxies keep the connection open. Streams run on
+the event loop of the ASGI server, so they do not take a worker thread from
+the control requests.
+"""
+import asyncio
+import json
+import logging
+import time
+
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from mate import metrics
+from mate.motors import MotorError
+from mate.server.owner import get_owner
+from mate.utils.defaults import TELEMETRY_INTERVAL
+
+logger = logging.getLogger("mate")
+
+MIN_INTERVAL = 0.05
+KEEPALIVE_INTERVAL = 15.0
+# Counters reported as rates in the stats event.
+RATE_COUNTERS = ("http.requests", "stream.messages", "udp.datagrams")
+
+
+def format_event(event, data, event_id):
+    """
+    Format one Server-Sent Event.
+    :return: str
+    """
+    return "id: {}\nevent: {}\ndata: {}\n\n".format(event_id, event, json.dumps(data, separators=(",", ":")))
+
+
+class Telemetry(object):
+    """Changes of the motor state and the metrics since the last poll of one client."""
+
+    def __init__(self):
+        self.motors = {}
+        self.counters = None
+        self.polled = None
+
+    def poll(self, now=None):
+        """
+        Return the events for what changed since the last poll.
+        :param now: time.monotonic() of the poll.
+        :return: list of (event, data) tuples.
+        """
+        now = time.monotonic() if now is None else now
+        events = []
+        changed = [
+            status for status in get_owner().status()["motors"] if self.motors.get(status["motorid"]) != status["pwm"]
+        ]
+        if changed:
+            self.motors.update((status["motorid"], status["pwm"]) for status in changed)
+            events.append(("motors", {"motors": changed}))
+        snapshot = metrics.snapshot()
+        counters = snapshot["counters"]
+        if self.counters is not None and counters != self.counters:
+            elapsed = now - self.polled
+            rates = {
+                name: (counters.get(name, 0) - self.counters.get(name, 0)) / elapsed
+                for name in RATE_COUNTERS
+                if name in counters
+            }
+            events.append(("stats", {"rates": rates, "latency": snapshot["histograms"]}))
+        self.counters = counters
+        self.polled = now
+        return events
+
+
+async def stream_events(interval):
+    """Yield Server-Sent Events every interval seconds until the client disconnects."""
+    loop = asyncio.get_running_loop()
+    telemetry = Telemetry()
+    event_id = 0
+    keepalive = time.monotonic() + KEEPALIVE_INTERVAL
+    while True:
+        try:
+            # The owner may be another process, do not block the event loop on it.
+            changes = await loop.run_in_executor(None, telemetry.poll)
+        except MotorError as err:
+            logger.debug("No motor status for the telemetry stream: {}".format(err))
+            changes = []
+        for event, data in changes:
+            event_id += 1
+            keepalive = time.monotonic() + KEEPALIVE_INTERVAL
+            yield format_event(event, data, event_id)
+        if time.monotonic() >= keepalive:
+            keepalive = time.monotonic() + KEEPALIVE_INTERVAL
+            yield ": keepalive\n\n"
+        await asyncio.sleep(interval)
+
+
+async def motor_events(request):
+    """Stream motor state and metrics changes as Server-Sent Events."""
+    try:
+        interval = max(float(request.query_params.get("interval", TELEMETRY_INTERVAL)), MIN_INTERVAL)
+    except ValueError:
+        return PlainTextResponse("interval must be a number of seconds.", status_code=400)
+    logger.info("Telemetry stream opened by {}.".format(request.client))
+    return StreamingResponse(
+        stream_events(interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+routes = [Route("/motor/events", motor_events, methods=["GET"])]
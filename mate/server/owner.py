@@ -0,0 +1,148 @@
+"""Single owner of the motors behind the HTTP frontends.
+
+When the HTTP API runs in one process, that process owns the motors and
+commands go to a local coalescer, or to a ramp engine when MATE_MOTOR_RAMP is
+set. 'mate serve-http --workers N' runs several
+worker processes, which must not each open the hardware. It then runs the UDP
+motor server as the owner on the loopback interface and sets MATE_MOTOR_OWNER
+(UDP address) and MATE_MOTOR_OWNER_STATUS (status endpoint URL). Workers
+forward their commands to the owner with a MotorClient and read the motor
+status from its status endpoint.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+
+from mate.client.udp import MotorClient
+from mate.coalescer import CommandCoalescer
+from mate.mixer import get_mixer
+from mate.motors import MotorError, check_frame, get_cache_stats, get_motor_status
+from mate.protocol import ProtocolError
+from mate.ramp import RampEngine
+from mate.utils.defaults import NUM_CHANNELS, OWNER_ENV_VAR, OWNER_STATUS_ENV_VAR, RAMP_ENV_VAR
+
+logger = logging.getLogger("mate")
+
+# Seconds a remote motor status is reused, so telemetry streams do not poll the owner per client.
+STATUS_CACHE = 0.05
+
+
+class LocalOwner(object):
+    """This process owns the motors, commands go to a coalescer or a ramp engine."""
+
+    def __init__(self, ramp=False):
+        """
+        :param ramp: ramp the motors towards the commands at the calibrated slew rates
+            (see mate.ramp) instead of writing them at once.
+        """
+        self.commands = RampEngine() if ramp else CommandCoalescer()
+        self.channels = self.commands.channels
+        self.commands.start()
+
+    def submit(self, frame, traces=None):
+        """Queue a frame, see CommandCoalescer.submit() and RampEngine.submit()."""
+        self.commands.submit(frame, traces)
+
+    def set_motor(self, motor, microseconds):
+        """Queue a command for one motor."""
+        self.commands.submit({motor: microseconds})
+
+    def mix(self, command):
+        """
+        Queue the thruster frame of a 6-DOF command, see mate.mixer.
+        :param command: len(mate.mixer.AXES) vector.
+        :return: dict of motor to microseconds.
+        """
+        return get_mixer().apply(command, write=self.submit)
+
+    def status(self):
+        """
+        Return the motor status from the shadow registers.
+        :return: dict with motors and cache.
+        """
+        return {"motors": get_motor_status(), "cache": get_cache_stats()}
+
+
+class RemoteOwner(object):
+    """Another process owns the motors, commands are forwarded to its UDP motor server."""
+
+    def __init__(self, address, status_url, channels=NUM_CHANNELS):
+        """
+        :param address: host:port of the owner's UDP motor server.
+        :param status_url: base URL of the owner's status endpoint.
+        :param channels: number of motors accepted by submit().
+        """
+        host, port = address.rsplit(":", 1)
+        # Submits run on the event loop of the ASGI server, so they must not wait for
+        # acknowledgements. The owner is on the loopback interface, where none are lost.
+        self.client = MotorClient(host, int(port), window=None)
+        self.address = address
+        self.status_url = status_url.rstrip("/") + "/motor"
+        self.channels = channels
+        self._lock = threading.Lock()
+        self._status = None
+        self._status_time = 0
+
+    def submit(self, frame, traces=None):
+        """
+        Forward a frame to the owner without blocking. Trace records stay in this process.
+        :param frame: dict of motor to microseconds.
+        :raise MotorError: for an invalid frame, or when the frame could not be sent.
+        """
+        check_frame(frame, self.channels)
+        try:
+            with self._lock:
+                self.client.set_motors(frame)
+        except (OSError, ProtocolError) as err:
+            raise MotorError("Unable to forward the motor command to {}: {}".format(self.address, err))
+
+    def set_motor(self, motor, microseconds):
+        """Forward a command for one motor."""
+        self.submit({motor: microseconds})
+
+    def mix(self, command):
+        """
+        Forward the thruster frame of a 6-DOF command, mixed in this process.
+        :param command: len(mate.mixer.AXES) vector.
+        :return: dict of motor to microseconds.
+        """
+        return get_mixer().apply(command, write=self.submit)
+
+    def status(self):
+        """
+        Return the motor status of the owner.
+        :return: dict with motors and cache.
+        """
+        now = time.monotonic()
+        if self._status is None or now - self._status_time > STATUS_CACHE:
+            try:
+                with urllib.request.urlopen(self.status_url, timeout=1) as response:
+                    self._status = json.loads(response.read().decode("utf-8"))
+            except (OSError, ValueError) as err:
+                raise MotorError("Unable to read the motor status from {}: {}".format(self.status_url, err))
+            self._status_time = now
+        return self._status
+
+
+_owner = None
+_owner_lock = threading.Lock()
+
+
+def get_owner():
+    """
+    Return the motor owner of this process, created on first use.
+    :return: LocalOwner or RemoteOwner
+    """
+    global _owner
+    with _owner_lock:
+        if _owner is None:
+            address = os.environ.get(OWNER_ENV_VAR)
+            if address:
+                _owner = RemoteOwner(address, os.environ[OWNER_STATUS_ENV_VAR])
+                logger.info("Forwarding motor commands to {}.".format(address))
+            else:
+                _owner = LocalOwner(ramp=bool(os.environ.get(RAMP_ENV_VAR)))
+        return _owner
@@ -1,11 +1,21 @@
 from flask import render_template
 import connexion
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from mate.server import diagnostics, events, stream, web
+from mate.server.fastpath import FastPath
+from mate.server.spec import load_specification
 
 # Create the application instance
 app = connexion.App(__name__, specification_dir='./')
 
-# Read the swagger.yml file to configure the endpoints
-app.add_api('controller.yaml')
+# Read the controller.yaml file to configure the endpoints, parsed once and then read from the spec cache
+app.add_api(load_specification())
+
+# ASGI application: the WebSocket control channel, the telemetry stream, metrics and traces next to
+# the REST API, with POST /motor answered by the precompiled fast path before the routing.
+application = FastPath(Starlette(routes=stream.routes + events.routes + diagnostics.routes + [Mount('/', app=app)]))
 
 # Create a URL route in our application for "/"
 @app.route('/')
@@ -19,4 +29,4 @@ def home():
 
 # If we're running in stand alone mode, run the application
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    web.run()
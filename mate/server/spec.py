@@ -0,0 +1,107 @@
+"""Cached loading of the OpenAPI spec of the HTTP motor API.
+
+Parsing controller.yaml is the slowest part of building the connexion
+application. The parsed spec is kept as JSON in a cache directory, keyed by
+the SHA-256 of the YAML file, so restarts with an unchanged spec read the JSON
+instead, and a changed spec is parsed again and replaces the stale entry.
+
+The cache directory is MATE_SPEC_CACHE, or ~/.cache/mate. When it cannot be
+written the spec is parsed on every start.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from yaml import load
+try:
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Loader
+
+from mate.utils.defaults import SPEC_CACHE_DIR, SPEC_CACHE_ENV_VAR
+
+logger = logging.getLogger("mate")
+
+SPECIFICATION = os.path.join(os.path.dirname(__file__), "controller.yaml")
+
+_loaded = {}
+
+
+def cache_dir():
+    """
+    Return the directory of the cached specs.
+    :return: str
+    """
+    return os.path.expanduser(os.environ.get(SPEC_CACHE_ENV_VAR, SPEC_CACHE_DIR))
+
+
+def cache_path(specification, digest, directory=None):
+    """
+    Return the cache file of a spec.
+    :param specification: path of the YAML spec.
+    :param digest: SHA-256 hex digest of the YAML spec.
+    :param directory: cache directory, default cache_dir().
+    :return: str
+    """
+    name = os.path.splitext(os.path.basename(specification))[0]
+    return os.path.join(directory or cache_dir(), "{}-{}.json".format(name, digest))
+
+
+def _write_cache(path, spec):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as cache_file:
+            json.dump(spec, cache_file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    prefix = path[:path.rindex("-") + 1]
+    for stale in glob.glob(prefix + "*.json"):
+        if stale != path:
+            os.unlink(stale)
+
+
+def load_specification(specification=SPECIFICATION, directory=None):
+    """
+    Return the parsed OpenAPI spec, from the cache when the YAML file is unchanged.
+    The result is shared within the process, do not modify it.
+    :param specification: path of the YAML spec.
+    :param directory: cache directory, default cache_dir().
+    :return: dict
+    """
+    with open(specification, "rb") as spec_file:
+        data = spec_file.read()
+    digest = hashlib.sha256(data).hexdigest()
+    spec = _loaded.get(digest)
+    if spec is not None:
+        return spec
+    path = cache_path(specification, digest, directory)
+    try:
+        with open(path) as cache_file:
+            spec = json.load(cache_file)
+        logger.debug("Loaded the spec {} from {}.".format(specification, path))
+    except (OSError, ValueError):
+        spec = load(data, Loader=Loader)
+        try:
+            _write_cache(path, spec)
+            logger.debug("Cached the spec {} in {}.".format(specification, path))
+        except (OSError, TypeError, ValueError) as err:
+            logger.warning("Unable to cache the spec {} in {}: {}".format(specification, path, err))
+    _loaded[digest] = spec
+    return spec
+
+
+def load_schema(name, specification=SPECIFICATION):
+    """
+    Return a schema of the components section of an OpenAPI spec.
+    :param name: schema name.
+    :param specification: path of the YAML spec.
+    :return: dict
+    """
+    return load_specification(specification)["components"]["schemas"][name]
@@ -0,0 +1,80 @@
+"""Read-only HTTP status endpoint for servers without an HTTP frontend.
+
+The UDP motor server runs it on its event loop so 'mate stats' and
+'mate trace dump' can read a running server with --url:
+
+    GET /motor            motor status from the shadow registers
+    GET /stats            mate.metrics.snapshot()
+    GET /trace?last=N     the last N records of mate.trace
+
+Only GET is supported and the connection is closed after each response.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs, urlsplit
+
+from mate import metrics, trace
+from mate.motors import get_cache_stats, get_motor_status
+
+logger = logging.getLogger("mate")
+
+REQUEST_TIMEOUT = 5.0
+
+
+def _motor(query):
+    return {"motors": get_motor_status(), "cache": get_cache_stats()}
+
+
+def _stats(query):
+    return metrics.snapshot()
+
+
+def _trace(query):
+    last = query.get("last")
+    return trace.records(int(last[0]) if last else None)
+
+
+ROUTES = {"/motor": _motor, "/stats": _stats, "/trace": _trace}
+
+
+def _response(status, body):
+    data = json.dumps(body).encode("utf-8")
+    header = "HTTP/1.0 {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n".format(status, len(data))
+    return header.encode("ascii") + data
+
+
+async def handle(reader, writer):
+    """Answer one HTTP request."""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+        while (await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)).strip():
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) < 2 or parts[0] != "GET":
+            writer.write(_response("405 Method Not Allowed", {"message": "Only GET is supported."}))
+        else:
+            url = urlsplit(parts[1])
+            route = ROUTES.get(url.path)
+            if route is None:
+                writer.write(_response("404 Not Found", {"message": "Unknown path {}.".format(url.path)}))
+            else:
+                try:
+                    writer.write(_response("200 OK", route(parse_qs(url.query))))
+                except ValueError as err:
+                    writer.write(_response("400 Bad Request", {"message": str(err)}))
+        await writer.drain()
+    except (asyncio.TimeoutError, OSError) as err:
+        logger.debug("Status request failed: {}".format(err))
+    finally:
+        writer.close()
+
+
+async def start(host, port):
+    """
+    Start the status endpoint on the running event loop.
+    :return: asyncio.Server
+    """
+    server = await asyncio.start_server(handle, host, port)
+    logger.info("Status endpoint listening on http://{}:{}/stats.".format(host, port))
+    return server
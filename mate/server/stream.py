@@ -0,0 +1,155 @@
+"""WebSocket streaming control channel.
+
+A client opens one WebSocket on /stream and keeps it for the whole session,
+so each command costs a message decode instead of an HTTP request cycle.
+
+Client to server, one motor command per message (see mate.protocol):
+
+    binary   binary command
+    text     JSON command
+
+Server to client:
+
+    binary   cumulative acknowledgement of the sequenced commands, every
+             ack_every commands or ack_interval seconds
+    text     {"error": "..."} for a command that was not applied
+    text     {"motors": [...]} motor status every telemetry_interval seconds
+
+Commands go to the motor owner of the process (see mate.server.owner), which
+the WebSocket shares with the REST operations. Values older, by sequence
+number, than the last one applied to a motor are dropped as in the UDP server.
+"""
+import asyncio
+import json
+import logging
+import time
+
+from starlette.routing import WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+from mate import metrics, trace
+from mate.motors import MotorError, check_frame
+from mate.protocol import ProtocolError, SequenceTracker, decode, timestamp_now
+from mate.server.owner import get_owner
+from mate.utils.defaults import ACK_EVERY, ACK_INTERVAL, TELEMETRY_INTERVAL
+
+logger = logging.getLogger("mate")
+
+SENDER = "stream"
+
+
+class MotorStream(object):
+    """State of one WebSocket control connection."""
+
+    def __init__(
+        self, websocket, ack_every=ACK_EVERY, ack_interval=ACK_INTERVAL, telemetry_interval=TELEMETRY_INTERVAL
+    ):
+        """
+        :param websocket: accepted starlette WebSocket.
+        :param ack_every: sequenced commands between acknowledgements.
+        :param ack_interval: longest time in seconds before a command is acknowledged.
+        :param telemetry_interval: seconds between motor status messages, 0 to disable them.
+        """
+        self.websocket = websocket
+        self.ack_every = ack_every
+        self.ack_interval = ack_interval
+        self.telemetry_interval = telemetry_interval
+        self.owner = get_owner()
+        self.tracker = SequenceTracker()
+        self.unacknowledged = 0
+        self._decode_latency = metrics.histogram("decode")
+        self._messages = metrics.counter("stream.messages")
+        self._errors = metrics.counter("stream.errors")
+
+    async def receive(self, message):
+        """
+        Apply one command.
+        :param message: bytes or str received from the client.
+        """
+        received = timestamp_now()
+        self._messages.add()
+        start = time.perf_counter_ns()
+        try:
+            command = decode(message.encode("utf-8") if isinstance(message, str) else message)
+        except ProtocolError as err:
+            await self.error(err)
+            return
+        self._decode_latency.record(time.perf_counter_ns() - start)
+        try:
+            check_frame(command.frame, self.owner.channels)
+        except MotorError as err:
+            await self.error(err)
+            return
+        traces = None
+        if command.trace is not None:
+            traces = [trace.begin(command.trace, command.timestamp, received)]
+            trace.mark(traces, "decoded")
+        sequence = command.sequence
+        if sequence is not None:
+            self.tracker.observe(SENDER, sequence, command.timestamp)
+            self.unacknowledged += 1
+        pending = {}
+        frame = {
+            motor: pwm
+            for motor, pwm in command.frame.items()
+            if self.tracker.accept(motor, SENDER, sequence, pending)
+        }
+        if frame:
+            try:
+                self.owner.submit(frame, traces)
+            except MotorError as err:
+                await self.error(err)
+            else:
+                self.tracker.record(pending)
+        if self.unacknowledged >= self.ack_every:
+            await self.acknowledge()
+
+    async def error(self, err):
+        """Tell the client a command was not applied."""
+        self._errors.add()
+        await self.websocket.send_text(json.dumps({"error": str(err)}))
+
+    async def acknowledge(self):
+        """Send the cumulative acknowledgement if commands are unacknowledged."""
+        if self.unacknowledged:
+            self.unacknowledged = 0
+            await self.websocket.send_bytes(self.tracker.ack(SENDER))
+
+    async def push(self):
+        """Send the pending acknowledgements and the telemetry until cancelled."""
+        loop = asyncio.get_running_loop()
+        next_telemetry = time.monotonic()
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            await self.acknowledge()
+            if self.telemetry_interval and time.monotonic() >= next_telemetry:
+                next_telemetry = time.monotonic() + self.telemetry_interval
+                try:
+                    status = await loop.run_in_executor(None, self.owner.status)
+                except MotorError as err:
+                    logger.debug("No motor status for the stream: {}".format(err))
+                    continue
+                await self.websocket.send_text(json.dumps({"motors": status["motors"]}))
+
+
+async def motor_stream(websocket):
+    """Serve one WebSocket control connection."""
+    await websocket.accept()
+    stream = MotorStream(websocket)
+    pusher = asyncio.ensure_future(stream.push())
+    logger.info("Motor stream opened by {}.".format(websocket.client))
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            await stream.receive(data if data is not None else message.get("text", ""))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pusher.cancel()
+        logger.info("Motor stream closed by {}.".format(websocket.client))
+
+
+routes = [WebSocketRoute("/stream", motor_stream)]
@@ -0,0 +1,278 @@
+"""UDP motor server built on asyncio.
+
+The socket is drained in batches when the event loop reports it readable.
+Datagrams are received into a pool of preallocated buffers with recvfrom_into,
+so no bytes object is created per packet. Each batch is decoded with
+mate.protocol (JSON or binary) and only the newest value per motor is submitted
+to a coalescer, which writes to the motors through the command bus, or with
+ramp to a ramp engine (see mate.ramp) as targets. A datagram with an invalid
+frame is answered with an error and skipped, so it never fails the batch. Values
+older, by sender sequence number, than the last value applied to a motor are
+dropped, so a reordered datagram never overwrites a newer command.
+
+Commands without a sequence number get a reply per datagram. Senders of
+sequenced commands get one cumulative acknowledgement (see mate.protocol) every
+ack_every datagrams or ack_interval seconds, so they can keep a window of
+commands in flight instead of waiting for a round trip per command. Senders
+without a sequenced command for sender_timeout seconds are forgotten.
+Timers and telemetry share the same event loop. Receive and decode latencies
+are recorded in mate.metrics and logged with the other stages every
+report_interval seconds. Traced commands start a trace record (see mate.trace)
+stamped with the time their batch was received. With status_port the metrics
+and trace records are served over HTTP, see mate.server.status.
+"""
+import asyncio
+import logging
+import socket
+import time
+
+from mate import metrics, trace
+from mate.bus import publish_stop
+from mate.coalescer import CommandCoalescer
+from mate.motors import MotorError, check_frame
+from mate.protocol import ProtocolError, SequenceTracker, decode, timestamp_now
+from mate.ramp import RampEngine
+from mate.server import status
+from mate.utils.defaults import (
+    ACK_EVERY,
+    ACK_INTERVAL,
+    FLUSH_RATE,
+    REPORT_INTERVAL,
+    SENDER_TIMEOUT,
+    UDP_BATCH_SIZE,
+    UDP_BUFFER_SIZE,
+    UDP_HOST,
+    UDP_PORT,
+)
+
+logger = logging.getLogger("mate")
+
+ACK = b"ok"
+
+
+class MotorServer(object):
+    """Receive motor commands in batches and reply to each sender."""
+
+    def __init__(self, sock, coalescer, batch_size=UDP_BATCH_SIZE, buffer_size=UDP_BUFFER_SIZE, ack_every=ACK_EVERY):
+        """
+        :param sock: bound, non-blocking UDP socket.
+        :param coalescer: CommandCoalescer or RampEngine receiving the frames.
+        :param batch_size: datagrams received per batch.
+        :param buffer_size: largest datagram accepted.
+        :param ack_every: sequenced datagrams per sender between acknowledgements.
+        """
+        self.sock = sock
+        self.coalescer = coalescer
+        self.ack_every = ack_every
+        self.unacknowledged = {}
+        self.buffers = [bytearray(buffer_size) for _ in range(batch_size)]
+        self.views = [memoryview(buffer) for buffer in self.buffers]
+        self.sizes = [0] * batch_size
+        self.senders = [None] * batch_size
+        self.tracker = SequenceTracker()
+        self.received = 0
+        self.errors = 0
+        self.batches = 0
+        self._receive_latency = metrics.histogram("receive")
+        self._decode_latency = metrics.histogram("decode")
+        self._datagrams = metrics.counter("udp.datagrams")
+        self._errors = metrics.counter("udp.errors")
+
+    def drain(self):
+        """Receive up to one batch of datagrams and apply the newest value per motor."""
+        receive_latency, decode_latency = self._receive_latency, self._decode_latency
+        count = 0
+        start = time.perf_counter_ns()
+        for _ in range(len(self.buffers)):
+            try:
+                self.sizes[count], self.senders[count] = self.sock.recvfrom_into(self.buffers[count])
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as err:
+                logger.debug("UDP error: {}".format(err))
+                continue
+            count += 1
+            now = time.perf_counter_ns()
+            receive_latency.record(now - start)
+            start = now
+        if not count:
+            return
+        self.received += count
+        self.batches += 1
+        self._datagrams.add(count)
+        received = timestamp_now()
+        traces = []
+        frame = {}
+        accepted = {}
+        replies = [ACK] * count
+        tracker = self.tracker
+        unacknowledged = self.unacknowledged
+        channels = self.coalescer.channels
+        for index in range(count):
+            start = time.perf_counter_ns()
+            try:
+                message = decode(self.views[index][:self.sizes[index]])
+                # One bad datagram must not fail the batch it is merged into.
+                check_frame(message.frame, channels)
+            except (ProtocolError, MotorError) as err:
+                self.errors += 1
+                self._errors.add()
+                replies[index] = str(err).encode("utf-8")
+                continue
+            decode_latency.record(time.perf_counter_ns() - start)
+            if message.trace is not None:
+                traces.append(trace.begin(message.trace, message.timestamp, received))
+            sender, sequence = self.senders[index], message.sequence
+            if sequence is not None:
+                tracker.observe(sender, sequence, message.timestamp)
+                unacknowledged[sender] = unacknowledged.get(sender, 0) + 1
+                replies[index] = None
+            for motor, pwm in message.frame.items():
+                if tracker.accept(motor, sender, sequence, accepted):
+                    frame[motor] = pwm
+        trace.mark(traces, "decoded")
+        if frame:
+            try:
+                self.coalescer.submit(frame, traces)
+            except MotorError as err:
+                self.errors += 1
+                self._errors.add()
+                replies = [str(err).encode("utf-8")] * count
+            else:
+                tracker.record(accepted)
+        for index in range(count):
+            if replies[index] is not None:
+                self._reply(replies[index], self.senders[index])
+        for sender, pending in unacknowledged.items():
+            if pending >= self.ack_every:
+                self.acknowledge(sender)
+
+    def acknowledge(self, sender=None):
+        """
+        Send cumulative acknowledgements.
+        :param sender: sender address, defaults to every sender with unacknowledged commands.
+        """
+        senders = [sender] if sender is not None else [key for key, value in self.unacknowledged.items() if value]
+        for sender in senders:
+            self.unacknowledged[sender] = 0
+            self._reply(self.tracker.ack(sender), sender)
+
+    def evict(self, max_idle):
+        """
+        Forget the senders without a sequenced command for max_idle seconds.
+        :param max_idle: seconds.
+        """
+        for sender in self.tracker.evict(max_idle):
+            self.unacknowledged.pop(sender, None)
+
+    def _reply(self, data, address):
+        try:
+            self.sock.sendto(data, address)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as err:
+            logger.debug("UDP error replying to {}: {}".format(address, err))
+
+
+async def report_rate(server, interval):
+    """Log the datagram rate and the stage latencies every interval seconds."""
+    count = server.received
+    start_time = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        rate = (server.received - count) / (now - start_time)
+        count, start_time = server.received, now
+        if rate:
+            tracker = server.tracker
+            logger.info(
+                "UDP rate {:.0f} datagrams/s, {} errors, {} stale, {} reordered, {} gaps, {} too old.".format(
+                    rate, server.errors, tracker.stale, tracker.reordered, tracker.gaps, tracker.too_old
+                )
+            )
+            logger.info("Stage latencies:\n{}".format(metrics.format_snapshot(metrics.snapshot())))
+
+
+async def acknowledge_periodically(server, interval):
+    """Send the pending cumulative acknowledgements every interval seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        server.acknowledge()
+
+
+async def evict_periodically(server, max_idle):
+    """Forget the senders idle for max_idle seconds, checking every max_idle seconds."""
+    while True:
+        await asyncio.sleep(max_idle)
+        server.evict(max_idle)
+
+
+async def serve(
+    host=UDP_HOST,
+    port=UDP_PORT,
+    rate=FLUSH_RATE,
+    report_interval=REPORT_INTERVAL,
+    ack_every=ACK_EVERY,
+    ack_interval=ACK_INTERVAL,
+    status_port=None,
+    ramp=False,
+    sender_timeout=SENDER_TIMEOUT,
+):
+    """
+    Run the UDP motor server until cancelled. All motors are stopped on exit.
+    :param host: address to bind.
+    :param port: UDP port.
+    :param rate: coalescer flushes per second.
+    :param report_interval: seconds between rate log messages.
+    :param ack_every: sequenced datagrams per sender between acknowledgements.
+    :param ack_interval: longest time in seconds before a datagram is acknowledged.
+    :param status_port: TCP port of the HTTP status endpoint, None to disable it.
+    :param ramp: ramp the motors towards the commands at the calibrated slew rates,
+        with rate control ticks per second, instead of coalescing them.
+    :param sender_timeout: seconds without a sequenced command after which a sender is forgotten.
+    """
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    sock.bind((host, port))
+    coalescer = RampEngine(rate=rate) if ramp else CommandCoalescer(rate)
+    coalescer.start()
+    server = MotorServer(sock, coalescer, ack_every=ack_every)
+    loop.add_reader(sock.fileno(), server.drain)
+    logger.info("UDP motor server listening on {}:{}.".format(host, port))
+    status_server = None
+    try:
+        if status_port is not None:
+            status_server = await status.start(host, status_port)
+        await asyncio.gather(
+            report_rate(server, report_interval),
+            acknowledge_periodically(server, ack_interval),
+            evict_periodically(server, sender_timeout),
+        )
+    finally:
+        if status_server is not None:
+            status_server.close()
+        loop.remove_reader(sock.fileno())
+        sock.close()
+        coalescer.stop()
+        publish_stop(wait=True)
+
+
+def run(
+    host=UDP_HOST,
+    port=UDP_PORT,
+    rate=FLUSH_RATE,
+    ack_every=ACK_EVERY,
+    ack_interval=ACK_INTERVAL,
+    status_port=None,
+    ramp=False,
+):
+    """Run the UDP motor server until interrupted."""
+    try:
+        asyncio.run(
+            serve(
+                host, port, rate, ack_every=ack_every, ack_interval=ack_interval, status_port=status_port, ramp=ramp
+            )
+        )
+    except KeyboardInterrupt:
+        logger.info("UDP motor server stopped.")
@@ -0,0 +1,128 @@
+"""Production serving of the HTTP motor API.
+
+The ASGI application of mate.server.server (REST API, WebSocket control
+channel, telemetry stream, /stats and /trace) runs under uvicorn, with
+keep-alive and configurable workers, listen backlog and connection limit.
+
+With one worker the server process owns the motors. With several workers this
+process starts the UDP motor server on the loopback interface as the single
+motor owner, and the workers forward their commands to it (see
+mate.server.owner). All motors are stopped when the server exits.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+
+from mate.bus import publish_stop
+from mate.server import udp
+from mate.utils.defaults import (
+    HTTP_BACKLOG,
+    HTTP_HOST,
+    HTTP_KEEP_ALIVE,
+    HTTP_PORT,
+    HTTP_WORKERS,
+    MIXER_ENV_VAR,
+    OWNER_ENV_VAR,
+    OWNER_PORT,
+    OWNER_STATUS_ENV_VAR,
+    OWNER_STATUS_PORT,
+    RAMP_ENV_VAR,
+)
+
+logger = logging.getLogger("mate")
+
+APPLICATION = "mate.server.server:application"
+OWNER_HOST = "127.0.0.1"
+OWNER_START_TIMEOUT = 5.0
+
+
+class ServerError(RuntimeError):
+    """Raised when the HTTP server cannot be started."""
+
+
+def start_owner(port=OWNER_PORT, status_port=OWNER_STATUS_PORT, ramp=False):
+    """
+    Start the UDP motor server on the loopback interface as the motor owner of the
+    workers, and point the workers at it through the environment.
+    :param port: UDP port of the owner.
+    :param status_port: TCP port of the owner's status endpoint.
+    :param ramp: ramp the motors at the calibrated slew rates, see mate.ramp.
+    """
+    thread = threading.Thread(
+        target=udp.run,
+        kwargs={"host": OWNER_HOST, "port": port, "status_port": status_port, "ramp": ramp},
+        name="mate-owner",
+        daemon=True,
+    )
+    thread.start()
+    status_url = "http://{}:{}".format(OWNER_HOST, status_port)
+    deadline = time.monotonic() + OWNER_START_TIMEOUT
+    while True:
+        try:
+            with urllib.request.urlopen(status_url + "/motor", timeout=1) as response:
+                json.loads(response.read().decode("utf-8"))
+            break
+        except (OSError, ValueError):
+            if not thread.is_alive() or time.monotonic() > deadline:
+                raise ServerError(
+                    "The motor owner did not start on UDP port {} and TCP port {}.".format(port, status_port)
+                )
+            time.sleep(0.05)
+    os.environ[OWNER_ENV_VAR] = "{}:{}".format(OWNER_HOST, port)
+    os.environ[OWNER_STATUS_ENV_VAR] = status_url
+    logger.info("Motor owner listening on {}:{}.".format(OWNER_HOST, port))
+
+
+def run(
+    host=HTTP_HOST,
+    port=HTTP_PORT,
+    workers=HTTP_WORKERS,
+    backlog=HTTP_BACKLOG,
+    limit_concurrency=None,
+    keep_alive=HTTP_KEEP_ALIVE,
+    owner_port=OWNER_PORT,
+    owner_status_port=OWNER_STATUS_PORT,
+    mixer=None,
+    ramp=False,
+):
+    """
+    Serve the HTTP motor API until interrupted.
+    :param host: address to bind.
+    :param port: TCP port.
+    :param workers: worker processes.
+    :param backlog: listen backlog of the server socket.
+    :param limit_concurrency: connections and tasks per worker before new requests get
+        503 responses, None for no limit.
+    :param keep_alive: seconds an idle keep-alive connection is kept open.
+    :param owner_port: UDP port of the motor owner, with several workers.
+    :param owner_status_port: TCP port of the motor owner's status endpoint, with several workers.
+    :param mixer: YAML file with the thruster allocation matrix for POST /mix, see mate.mixer.
+    :param ramp: ramp the motors towards the commands at the calibrated slew rates, see mate.ramp.
+    """
+    try:
+        import uvicorn
+    except ImportError:
+        raise ServerError("'mate serve-http' requires the uvicorn package: pip install 'uvicorn[standard]'")
+    if mixer:
+        # The workers import the application, and create their mixer, after this.
+        os.environ[MIXER_ENV_VAR] = os.path.abspath(mixer)
+    if workers > 1:
+        start_owner(owner_port, owner_status_port, ramp)
+    elif ramp:
+        os.environ[RAMP_ENV_VAR] = "1"
+    try:
+        uvicorn.run(
+            APPLICATION,
+            host=host,
+            port=port,
+            workers=workers,
+            backlog=backlog,
+            limit_concurrency=limit_concurrency,
+            timeout_keep_alive=keep_alive,
+            access_log=False,
+        )
+    finally:
+        publish_stop(wait=True)
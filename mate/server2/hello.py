@@ -5,11 +5,19 @@ import json
 from flask import Flask, request, jsonify
 import time
 import logging
-count = 0
-start_time = 0
+
+from mate import metrics, trace
+from mate.coalescer import CommandCoalescer
+from mate.motors import MotorError, get_cache_stats, get_motor_status
+from mate.protocol import ProtocolError, frame_from_json, timestamp_now, trace_from_json
+
 app = Flask(__name__)
 log = logging.getLogger('werkzeug')
 log.disabled = True
+coalescer = CommandCoalescer()
+coalescer.start()
+http_latency = metrics.histogram("http")
+http_requests = metrics.counter("http.requests")
 
 
 @app.route('/')
@@ -20,31 +28,70 @@ def hello_world():
 @app.route("/motor", methods=['POST'])
 def hello():
     # logging.info('hello')
-    global count
-    global start_time
+    start = time.perf_counter_ns()
+    received = timestamp_now()
+    http_requests.add()
     if request.method == "POST":
         # print("got request method POST")
         pass
     if request.is_json:
         # print("is json")
-        count += 1
-        if count == 1:
-            start_time = time.time()
         data = request.get_json()
         # print("type of data {}".format(type(data))) # type dict
         # print("data {}".format(data)) # type dict
         # print("data as string {}".format(json.dumps(data)))
-        if (count % 1000) == 0:
-            rate = count/(time.time() - start_time)
-            print("Rate == {} qps".format(rate))
 
-        motorid = data['motorid']
-        pwm = data['pwm']
+        try:
+            frame = frame_from_json(data)
+            trace_id, sent = trace_from_json(data)
+            traces = None
+            if trace_id is not None:
+                traces = [trace.begin(trace_id, sent, received)]
+                trace.mark(traces, "decoded")
+            coalescer.submit(frame, traces)
+        except (ProtocolError, MotorError) as err:
+            return jsonify(message=str(err)), 400
         # print("MotorID: {} PWM: {}".format(motorid, pwm))
 
         # print("MotorID: {} PWM: {}".format[data['motorid'], data['pwm']])
         # print ("keys {}".format(json.dumps(data.keys())))
+    http_latency.record(time.perf_counter_ns() - start)
     return jsonify(message='success')
+
+
+@app.route("/motor", methods=['GET'])
+def motor_status():
+    return jsonify(motors=get_motor_status(), cache=get_cache_stats())
+
+
+@app.route("/motors", methods=['POST'])
+def motors():
+    start = time.perf_counter_ns()
+    received = timestamp_now()
+    http_requests.add()
+    try:
+        data = request.get_json(force=True)
+        frame = frame_from_json(data)
+        trace_id, sent = trace_from_json(data)
+        traces = None
+        if trace_id is not None:
+            traces = [trace.begin(trace_id, sent, received)]
+            trace.mark(traces, "decoded")
+        coalescer.submit(frame, traces)
+    except (ProtocolError, MotorError) as err:
+        return jsonify(message=str(err)), 400
+    http_latency.record(time.perf_counter_ns() - start)
+    return jsonify(message='success')
+
+
+@app.route("/stats", methods=['GET'])
+def stats():
+    return jsonify(metrics.snapshot())
+
+
+@app.route("/trace", methods=['GET'])
+def trace_records():
+    return jsonify(trace.records(request.args.get('last', default=None, type=int)))
 #
 # @app.route('/motor', methods=['POST', 'GET'])
 # def motor():
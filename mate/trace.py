@@ -0,0 +1,161 @@
+"""End-to-end tracing of motor commands.
+
+A command that carries a trace id (see mate.protocol) gets a trace record. Each
+stage of the command path stamps the record with the time it finished, in
+microseconds since the epoch, so the client send timestamp can be compared with
+the server stamps when both clocks are synchronised (e.g. with NTP or PTP):
+
+    sent       client send timestamp, from the command
+    received   datagram read or HTTP request started
+    decoded    command decoded and submitted to the coalescer
+    published  coalescer flushed it to the command bus
+    dequeued   bus writer took it off the queue
+    written    driver write returned
+
+Records are kept in a fixed-size ring buffer, so only the last TRACE_BUFFER_SIZE
+traced commands are kept. Commands merged into one write share the dequeued and
+written stamps. Commands dropped by a stop, or superseded before they were
+published, keep the stamps they reached.
+"""
+import itertools
+
+from mate.metrics import PERCENTILES
+from mate.protocol import timestamp_now
+from mate.utils.defaults import TRACE_BUFFER_SIZE
+
+STAGES = ("sent", "received", "decoded", "published", "dequeued", "written")
+# Latency breakdown reported by breakdown(): name, from stage, to stage.
+INTERVALS = (
+    ("network", "sent", "received"),
+    ("decode", "received", "decoded"),
+    ("coalesce", "decoded", "published"),
+    ("queue", "published", "dequeued"),
+    ("write", "dequeued", "written"),
+    ("total", "sent", "written"),
+)
+_INDEX = {stage: index for index, stage in enumerate(STAGES, 2)}
+
+
+class TraceBuffer(object):
+    """Ring buffer of trace records.
+
+    A record is a list of its position in the buffer and the trace id, followed
+    by one stamp per stage, None until the stage is reached. Writers never lock,
+    the position orders the records when they are read.
+    """
+
+    def __init__(self, size=TRACE_BUFFER_SIZE):
+        """
+        :param size: number of records kept.
+        """
+        self.size = size
+        self._records = [None] * size
+        self._count = itertools.count()
+
+    def begin(self, trace_id, sent=None, received=None):
+        """
+        Start the record of a traced command.
+        :param trace_id: trace id of the command.
+        :param sent: client send timestamp in microseconds since the epoch.
+        :param received: time the command was received, defaults to now.
+        :return: the record, to be passed to mark() by the later stages.
+        """
+        position = next(self._count)
+        record = [position, trace_id, sent, timestamp_now() if received is None else received, None, None, None, None]
+        self._records[position % self.size] = record
+        return record
+
+    @staticmethod
+    def mark(records, stage, timestamp=None):
+        """
+        Stamp records with the time a stage finished.
+        :param records: iterable of records returned by begin().
+        :param stage: one of STAGES.
+        :param timestamp: microseconds since the epoch, defaults to now.
+        """
+        index = _INDEX[stage]
+        timestamp = timestamp_now() if timestamp is None else timestamp
+        for record in records:
+            record[index] = timestamp
+
+    def records(self, last=None):
+        """
+        Return copies of the kept records, oldest first.
+        :param last: number of most recent records, defaults to all.
+        """
+        records = sorted((record for record in self._records if record is not None), key=lambda record: record[0])
+        if last:
+            records = records[-last:]
+        return [dict(zip(("trace",) + STAGES, record[1:])) for record in records]
+
+    def clear(self):
+        """Forget every record."""
+        self._records = [None] * self.size
+
+
+_buffer = TraceBuffer()
+
+
+def begin(trace_id, sent=None, received=None):
+    """Start a record in the process wide trace buffer, see TraceBuffer.begin()."""
+    return _buffer.begin(trace_id, sent, received)
+
+
+def mark(records, stage, timestamp=None):
+    """Stamp records with the time a stage finished, see TraceBuffer.mark()."""
+    if records:
+        TraceBuffer.mark(records, stage, timestamp)
+
+
+def records(last=None):
+    """Return the most recent records of the process wide trace buffer."""
+    return _buffer.records(last)
+
+
+def clear():
+    """Forget every record of the process wide trace buffer."""
+    _buffer.clear()
+
+
+def breakdown(record):
+    """
+    Return the latency of each interval of a record.
+    :param record: dict returned by records().
+    :return: dict of interval name to microseconds, None when a stamp is missing.
+    """
+    result = {}
+    for name, start, end in INTERVALS:
+        if record.get(start) is None or record.get(end) is None:
+            result[name] = None
+        else:
+            result[name] = record[end] - record[start]
+    return result
+
+
+def format_records(records):
+    """
+    Format records as a per-stage latency table followed by percentiles.
+    :param records: list of dicts returned by records().
+    :return: str
+    """
+    names = [name for name, _, _ in INTERVALS]
+    lines = ["{:>10s} ".format("trace") + " ".join("{:>9s}".format(name) for name in names)]
+    columns = {name: [] for name in names}
+    for record in records:
+        latencies = breakdown(record)
+        cells = []
+        for name in names:
+            if latencies[name] is None:
+                cells.append("{:>9s}".format("-"))
+            else:
+                columns[name].append(latencies[name])
+                cells.append("{:9d}".format(latencies[name]))
+        lines.append("{:>10} ".format(record["trace"]) + " ".join(cells))
+    lines.append("")
+    for label, fraction in PERCENTILES + (("max", 1.0),):
+        cells = []
+        for name in names:
+            values = sorted(columns[name])
+            cells.append("{:9d}".format(values[int(fraction * (len(values) - 1))]) if values else "{:>9s}".format("-"))
+        lines.append("{:>10s} ".format(label) + " ".join(cells))
+    return "\n".join(lines)
@@ -1,2 +1,67 @@
 """Default values for various enums.
 """
+# Motor driver backend used when neither the CLI nor MATE_MOTOR_DRIVER selects one.
+DEFAULT_DRIVER = "simulated"
+DRIVER_ENV_VAR = "MATE_MOTOR_DRIVER"
+# YAML file with per-motor calibration, see mate.calibration.
+CALIBRATION_ENV_VAR = "MATE_CALIBRATION"
+# YAML file with the thruster allocation matrix of the servers, see mate.mixer.
+MIXER_ENV_VAR = "MATE_MIXER"
+
+# SparkFun Servo Hat (PCA9685) settings.
+I2C_BUS = 1
+PCA9685_ADDRESS = 0x40
+PCA9685_OSCILLATOR = 25000000
+PCA9685_RESOLUTION = 4096
+NUM_CHANNELS = 16
+PWM_FREQUENCY = 50
+
+# ESC pulse widths in microseconds.
+NEUTRAL_MICROSECONDS = 1500
+MIN_MICROSECONDS = 1100
+MAX_MICROSECONDS = 1900
+
+# Rate in Hz at which coalesced motor commands are written to the driver.
+FLUSH_RATE = 100
+# Commands that can wait on the motor command bus before publish() fails.
+BUS_QUEUE_SIZE = 64
+
+# UDP motor server.
+UDP_HOST = "0.0.0.0"
+UDP_PORT = 20001
+REPORT_INTERVAL = 10.0
+# Datagrams drained per wake-up of the UDP server, and the size of each receive buffer.
+UDP_BATCH_SIZE = 64
+UDP_BUFFER_SIZE = 2048
+# Sequenced UDP commands are acknowledged every ACK_EVERY datagrams or ACK_INTERVAL seconds.
+ACK_EVERY = 32
+ACK_INTERVAL = 0.02
+# Seconds without a sequenced command after which the UDP server forgets a sender.
+SENDER_TIMEOUT = 60.0
+# UDP client: sequenced commands in flight before waiting for an acknowledgement,
+# and seconds to wait before giving up on lost acknowledgements.
+CLIENT_WINDOW = 256
+ACK_TIMEOUT = 0.5
+
+# Traced motor commands kept for 'mate trace dump', see mate.trace.
+TRACE_BUFFER_SIZE = 4096
+# Seconds between motor status messages on the WebSocket control channel.
+TELEMETRY_INTERVAL = 0.5
+
+# 'mate serve-http': ASGI server settings.
+HTTP_HOST = "0.0.0.0"
+HTTP_PORT = 5000
+HTTP_WORKERS = 1
+HTTP_BACKLOG = 2048
+HTTP_KEEP_ALIVE = 5
+# With several workers the motors are owned by a UDP motor server on the loopback
+# interface, see mate.server.owner.
+OWNER_ENV_VAR = "MATE_MOTOR_OWNER"
+OWNER_STATUS_ENV_VAR = "MATE_MOTOR_OWNER_STATUS"
+OWNER_PORT = 20101
+OWNER_STATUS_PORT = 20102
+# Set to ramp the commands of the HTTP server at the calibrated slew rates, see mate.ramp.
+RAMP_ENV_VAR = "MATE_MOTOR_RAMP"
+# Parsed OpenAPI specs of the HTTP server, see mate.server.spec.
+SPEC_CACHE_ENV_VAR = "MATE_SPEC_CACHE"
+SPEC_CACHE_DIR = "~/.cache/mate"
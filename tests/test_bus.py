@@ -0,0 +1,99 @@
+"""Tests for mate.bus."""
+import threading
+import time
+import unittest
+
+from mate.bus import CommandBus
+from mate.motors import MotorError
+
+
+class TestCommandBus(unittest.TestCase):
+    """CommandBus with recording write and stop functions."""
+
+    def setUp(self):
+        self.calls = []
+        self.bus = CommandBus(maxsize=4, write=self.write, stop=self.stop)
+
+    def tearDown(self):
+        self.bus.close()
+
+    def write(self, frame):
+        self.calls.append(("write", frame))
+
+    def stop(self):
+        self.calls.append(("stop", None))
+
+    def test_pending_frames_are_merged(self):
+        self.bus.publish({0: 1500, 1: 1500})
+        self.bus.publish({1: 1600})
+        self.bus.publish({2: 1700})
+        self.bus.start()
+        self.bus.close()
+        self.assertEqual(self.calls, [("write", {0: 1500, 1: 1600, 2: 1700})])
+        self.assertEqual(self.bus.merged, 2)
+        self.assertEqual(self.bus.writes, 1)
+
+    def test_stop_preempts_pending_frames(self):
+        self.bus.publish({0: 1900})
+        results = []
+        waiting = threading.Thread(target=self._publish_and_wait, args=({1: 1900}, results))
+        waiting.start()
+        while self.bus.published < 2:
+            time.sleep(0.001)
+        self.bus.publish_stop()
+        waiting.join()
+        self.bus.start()
+        self.bus.close()
+        self.assertEqual(self.calls, [("stop", None)])
+        self.assertEqual(self.bus.discarded, 2)
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], MotorError)
+
+    def _publish_and_wait(self, frame, results):
+        try:
+            self.bus.publish(frame, wait=True)
+        except MotorError as err:
+            results.append(err)
+
+    def test_stop_discards_frames_of_an_older_generation(self):
+        generation = self.bus.generation
+        self.bus.publish_stop()
+        self.bus.publish({0: 1900}, generation=generation)
+        self.bus.publish({1: 1600}, generation=self.bus.generation)
+        self.bus.start()
+        self.bus.close()
+        self.assertEqual(self.calls, [("stop", None), ("write", {1: 1600})])
+        self.assertEqual(self.bus.discarded, 1)
+
+    def test_invalid_frames_are_refused_before_they_are_merged(self):
+        self.bus.publish({2: 1600})
+        for frame in ({20: 1500}, {-1: 1500}, {3: "fast"}, {3: None}, {3: float("nan")}):
+            with self.assertRaises(MotorError):
+                self.bus.publish(frame)
+        self.bus.start()
+        self.bus.close()
+        self.assertEqual(self.calls, [("write", {2: 1600})])
+
+    def test_full_bus_refuses_frames(self):
+        for motor in range(self.bus.maxsize):
+            self.bus.publish({motor: 1500})
+        with self.assertRaises(MotorError):
+            self.bus.publish({0: 1600})
+        self.bus.publish_stop()
+        self.bus.publish({0: 1600})
+
+    def test_write_error_is_raised_to_waiting_publisher(self):
+        def fail(frame):
+            raise MotorError("I2C error")
+
+        bus = CommandBus(write=fail, stop=self.stop)
+        bus.start()
+        try:
+            with self.assertRaises(MotorError):
+                bus.publish({0: 1500}, wait=True)
+        finally:
+            bus.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
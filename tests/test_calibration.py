@@ -0,0 +1,66 @@
+"""Tests for the mate.calibration lookup tables."""
+import unittest
+
+from mate.calibration import Calibration, microseconds_to_ticks
+from mate.drivers import MotorError
+from mate.utils.defaults import MAX_MICROSECONDS, MIN_MICROSECONDS, NEUTRAL_MICROSECONDS, PWM_FREQUENCY
+
+
+def ticks(microseconds):
+    return int(microseconds_to_ticks(microseconds, PWM_FREQUENCY))
+
+
+class TestCalibration(unittest.TestCase):
+
+    def test_ticks(self):
+        # 20 ms period at 50 Hz in 4096 ticks: 4.8828 us per tick.
+        self.assertEqual(ticks(MIN_MICROSECONDS), 225)
+        self.assertEqual(ticks(NEUTRAL_MICROSECONDS), 307)
+        self.assertEqual(ticks(MAX_MICROSECONDS), 389)
+
+    def test_limits(self):
+        calibration = Calibration({}, 4, PWM_FREQUENCY)
+        self.assertEqual(calibration.ticks(0, MIN_MICROSECONDS), ticks(MIN_MICROSECONDS))
+        self.assertEqual(calibration.ticks(0, MAX_MICROSECONDS), ticks(MAX_MICROSECONDS))
+        # Commands outside the calibrated range are clamped to it.
+        self.assertEqual(calibration.ticks(0, 0), ticks(MIN_MICROSECONDS))
+        self.assertEqual(calibration.ticks(0, MIN_MICROSECONDS - 1), ticks(MIN_MICROSECONDS))
+        self.assertEqual(calibration.ticks(0, MAX_MICROSECONDS + 1), ticks(MAX_MICROSECONDS))
+        self.assertEqual(calibration.ticks(0, 65535), ticks(MAX_MICROSECONDS))
+        self.assertEqual(calibration.ticks(0, 1600.7), ticks(1600))
+        self.assertEqual(calibration.neutral_ticks, [ticks(NEUTRAL_MICROSECONDS)] * 4)
+
+    def test_per_motor_limits(self):
+        settings = {"defaults": {"min": 1200, "max": 1800}, "motors": {1: {"min": 1000, "max": 2000}}}
+        calibration = Calibration(settings, 2, PWM_FREQUENCY)
+        self.assertEqual((calibration.low, calibration.high), (1000, 2000))
+        self.assertEqual(calibration.ticks(0, 1000), ticks(1200))
+        self.assertEqual(calibration.ticks(0, 2000), ticks(1800))
+        self.assertEqual(calibration.ticks(1, 1000), ticks(1000))
+        self.assertEqual(calibration.ticks(1, 2000), ticks(2000))
+
+    def test_deadband_reverse_and_trim(self):
+        settings = {"motors": {0: {"deadband": 25}, 1: {"reverse": True}, 2: {"trim": 50}}}
+        calibration = Calibration(settings, 3, PWM_FREQUENCY)
+        self.assertEqual(calibration.ticks(0, 1525), ticks(1500))
+        self.assertEqual(calibration.ticks(0, 1530), ticks(1530))
+        self.assertEqual(calibration.ticks(1, 1700), ticks(1300))
+        self.assertEqual(calibration.ticks(2, 1600), ticks(1650))
+        # Trim never takes the output beyond the limits.
+        self.assertEqual(calibration.ticks(2, MAX_MICROSECONDS), ticks(MAX_MICROSECONDS))
+
+    def test_curve(self):
+        settings = {"defaults": {"curve": [[1100, 1180], [1500, 1500], [1900, 1820]]}}
+        calibration = Calibration(settings, 1, PWM_FREQUENCY)
+        self.assertEqual(calibration.ticks(0, 1100), ticks(1180))
+        self.assertEqual(calibration.ticks(0, 1700), ticks(1660))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(MotorError):
+            Calibration({"defaults": {"neutral": 2000}}, 1, PWM_FREQUENCY)
+        with self.assertRaises(MotorError):
+            Calibration({"motors": {0: {"gain": 2}}}, 1, PWM_FREQUENCY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Tests for the mate command line."""
+import unittest
+
+from click.testing import CliRunner
+
+from mate.cli.cli import cli
+from mate.mixer import Mixer
+from mate.motors import get_motor_status
+
+
+class TestMix(unittest.TestCase):
+
+    def mix(self, *command):
+        return CliRunner().invoke(cli, ["--driver", "simulated", "mix"] + list(command))
+
+    def test_negative_axes(self):
+        command = [0.5, 0, 0, 0, 0, -0.3]
+        result = self.mix(*[str(value) for value in command])
+        self.assertEqual(result.exit_code, 0, result.output)
+        expected = Mixer().frame(command)
+        status = {motor["motorid"]: motor["pwm"] for motor in get_motor_status()}
+        for motor, pwm in expected.items():
+            self.assertEqual(status[motor], pwm)
+
+    def test_out_of_range(self):
+        result = self.mix("0.5", "0", "0", "0", "0", "-1.5")
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("-1.5", result.output)
+
+    def test_axis_count(self):
+        self.assertEqual(self.mix("0.5", "-0.5").exit_code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for mate.client.udp.MotorClient over loopback sockets."""
+import socket
+import time
+import unittest
+
+from mate.client.udp import MotorClient
+from mate.protocol import SequenceTracker, decode_binary
+
+HOST = "127.0.0.1"
+
+
+class TestMotorClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind((HOST, 0))
+        self.server.settimeout(1.0)
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_commands_are_sequenced(self):
+        with MotorClient(HOST, self.port) as client:
+            client.set_motor(1, 1600)
+            client.set_motors([1500, None, 1400], trace=9)
+            first = decode_binary(self.server.recv(64))
+            second = decode_binary(self.server.recv(64))
+        self.assertEqual((first.frame, first.sequence, first.trace), ({1: 1600}, 1, None))
+        self.assertEqual((second.frame, second.sequence, second.trace), ({0: 1500, 2: 1400}, 2, 9))
+
+    def test_acknowledgements_open_the_window(self):
+        tracker = SequenceTracker()
+        with MotorClient(HOST, self.port, window=2, timeout=1.0) as client:
+            client.set_motor(0, 1500)
+            client.set_motor(0, 1501)
+            for _ in range(2):
+                data, address = self.server.recvfrom(64)
+                message = decode_binary(data)
+                tracker.observe(address, message.sequence, message.timestamp)
+            self.server.sendto(tracker.ack(address), address)
+            client.set_motor(0, 1502)
+            self.assertEqual(client.acknowledged, 2)
+            self.assertEqual((client.acks, client.timeouts), (1, 0))
+            self.assertEqual(client.in_flight, 1)
+            self.assertEqual(len(client.rtt), 1)
+
+    def test_full_window_times_out(self):
+        with MotorClient(HOST, self.port, window=1, timeout=0.05) as client:
+            client.set_motor(0, 1500)
+            start = time.perf_counter()
+            client.set_motor(0, 1501)
+            self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+            self.assertEqual(client.timeouts, 1)
+            self.assertEqual(client.sent, 2)
+
+    def test_server_down(self):
+        self.server.close()
+        with MotorClient(HOST, self.port, window=2, timeout=1.0) as client:
+            for pwm in range(1500, 1510):
+                client.set_motor(0, pwm)
+                # Let the ICMP port unreachable arrive before the next send.
+                time.sleep(0.01)
+            self.assertEqual(client.sent, 10)
+            self.assertGreater(client.refused, 0)
+            self.assertEqual(client.timeouts, 0)
+            self.assertEqual(client.stats()["refused"], client.refused)
+
+
+if __name__ == "__main__":
+    unittest.main()
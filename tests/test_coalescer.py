@@ -0,0 +1,73 @@
+"""Tests for mate.coalescer.CommandCoalescer."""
+import unittest
+
+from mate.coalescer import CommandCoalescer
+from mate.motors import MotorError
+
+
+class FakeBus(object):
+    """Records published frames, publish_stop() only advances the generation."""
+
+    def __init__(self):
+        self.generation = 0
+        self.frames = []
+
+    def publish(self, frame, wait=False, generation=None, traces=None):
+        self.frames.append((frame, generation, traces))
+
+    def publish_stop(self, wait=False):
+        self.generation += 1
+
+
+class TestCommandCoalescer(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeBus()
+        self.coalescer = CommandCoalescer(rate=1000, bus=self.bus)
+
+    def test_last_write_wins(self):
+        self.coalescer.submit({0: 1500, 1: 1500})
+        self.coalescer.submit({0: 1600})
+        self.coalescer.set_motor(0, 1700)
+        self.coalescer.flush()
+        self.assertEqual(self.bus.frames, [({0: 1700, 1: 1500}, 0, [])])
+        self.assertEqual((self.coalescer.received, self.coalescer.superseded), (4, 2))
+
+    def test_windows_are_flushed_apart(self):
+        self.coalescer.submit({0: 1600})
+        self.coalescer.flush()
+        self.coalescer.flush()
+        self.coalescer.submit({1: 1400})
+        self.coalescer.flush()
+        self.assertEqual([frame for frame, _, _ in self.bus.frames], [{0: 1600}, {1: 1400}])
+        self.assertEqual(self.coalescer.flushes, 2)
+
+    def test_traces_are_passed_on(self):
+        first, second = [1, None, None, None, None, None, None, None], [2, None, None, None, None, None, None, None]
+        self.coalescer.submit({0: 1600}, [first])
+        self.coalescer.submit({0: 1700}, [second])
+        self.coalescer.flush()
+        self.assertEqual(self.bus.frames[0][2], [first, second])
+
+    def test_stop_drops_pending(self):
+        self.coalescer.submit({0: 1600})
+        self.bus.publish_stop()
+        self.coalescer.submit({1: 1700})
+        self.coalescer.flush()
+        self.assertEqual(self.bus.frames, [({1: 1700}, 1, [])])
+
+    def test_invalid_frame(self):
+        with self.assertRaises(MotorError):
+            self.coalescer.submit({0: 1600, 16: 1500})
+        self.coalescer.flush()
+        self.assertEqual(self.bus.frames, [])
+
+    def test_thread_flushes(self):
+        self.coalescer.start()
+        self.coalescer.submit({0: 1600})
+        self.coalescer.stop()
+        self.assertEqual(self.bus.frames[0][0], {0: 1600})
+
+
+if __name__ == "__main__":
+    unittest.main()
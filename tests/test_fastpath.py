@@ -0,0 +1,36 @@
+"""Tests for the compiled POST /motor validator of mate.server.fastpath."""
+import unittest
+
+from mate.server.fastpath import compile_validator, validate_motor_request
+
+
+class TestValidateMotorRequest(unittest.TestCase):
+
+    def test_valid(self):
+        self.assertIsNone(validate_motor_request({"motorid": 0, "pwm": 1500}))
+        self.assertIsNone(validate_motor_request({"motorid": 15, "pwm": 1500, "trace": 7, "ts": 1700000000000000}))
+        self.assertIsNone(validate_motor_request({"motorid": 1, "pwm": 1500, "trace": None, "extra": "x"}))
+
+    def test_invalid(self):
+        for data in (
+            [1, 1500],
+            {"pwm": 1500},
+            {"motorid": 16, "pwm": 1500},
+            {"motorid": 1, "pwm": -1},
+            {"motorid": True, "pwm": 1500},
+            {"motorid": 1, "pwm": 1500.5},
+            {"motorid": 1, "pwm": 1500, "trace": {"a": 1}},
+            {"motorid": 1, "pwm": 1500, "trace": "7"},
+            {"motorid": 1, "pwm": 1500, "trace": 2 ** 32},
+            {"motorid": 1, "pwm": 1500, "trace": 7, "ts": "abc"},
+            {"motorid": 1, "pwm": 1500, "trace": 7, "ts": -5},
+        ):
+            self.assertIsInstance(validate_motor_request(data), str, data)
+
+    def test_only_integer_properties(self):
+        with self.assertRaises(ValueError):
+            compile_validator({"properties": {"name": {"type": "string"}}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the mate.metrics histograms."""
+import random
+import threading
+import unittest
+
+from mate import metrics
+
+
+class TestBuckets(unittest.TestCase):
+
+    def values(self):
+        rng = random.Random(1)
+        values = list(range(4 * metrics.SUB_BUCKETS))
+        values += [1 << bits for bits in range(metrics.MAX_BITS)]
+        values += [(1 << bits) - 1 for bits in range(1, metrics.MAX_BITS)]
+        values += [rng.randrange(1 << metrics.MAX_BITS) for _ in range(10000)]
+        return sorted(set(values))
+
+    def test_small_values_are_exact(self):
+        for value in range(2 * metrics.SUB_BUCKETS):
+            self.assertEqual(metrics.bucket_index(value), value)
+            self.assertEqual(metrics.bucket_value(value), value)
+
+    def test_index_is_monotonic(self):
+        indexes = [metrics.bucket_index(value) for value in self.values()]
+        self.assertEqual(indexes, sorted(indexes))
+        self.assertLess(indexes[-1], metrics.BUCKETS)
+
+    def test_relative_error(self):
+        for value in self.values():
+            estimate = metrics.bucket_value(metrics.bucket_index(value))
+            self.assertLessEqual(abs(estimate - value), value / metrics.SUB_BUCKETS, value)
+
+    def test_value_is_in_its_bucket(self):
+        for index in range(metrics.BUCKETS):
+            self.assertEqual(metrics.bucket_index(metrics.bucket_value(index)), index)
+
+    def test_large_values_are_clamped(self):
+        self.assertEqual(metrics.bucket_index(1 << (metrics.MAX_BITS + 5)), metrics.BUCKETS - 1)
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertIsNone(metrics.Histogram("test").summary())
+
+    def test_summary(self):
+        histogram = metrics.Histogram("test")
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 1000)
+        self.assertEqual((summary["min"], summary["max"]), (1.0, 1000.0))
+        self.assertAlmostEqual(summary["mean"], 500.5)
+        for label, fraction in metrics.PERCENTILES:
+            self.assertAlmostEqual(summary[label], fraction * 1000, delta=fraction * 1000 / metrics.SUB_BUCKETS + 1)
+
+    def test_percentiles_are_clamped(self):
+        histogram = metrics.Histogram("test")
+        histogram.record(1000001)
+        histogram.record(1000001)
+        summary = histogram.summary(scale=1)
+        for label, _ in metrics.PERCENTILES:
+            self.assertEqual(summary[label], 1000001)
+
+    def test_negative_values_are_recorded_as_zero(self):
+        histogram = metrics.Histogram("test")
+        histogram.record(-5)
+        self.assertEqual(histogram.summary(scale=1)["max"], 0)
+
+
+class TestShards(unittest.TestCase):
+
+    def run_threads(self, target, count=200):
+        for _ in range(count):
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+
+    def test_exited_threads_are_folded(self):
+        histogram = metrics.Histogram("test")
+        counter = metrics.Counter("test")
+        histogram.record(5)
+
+        def record():
+            histogram.record(10)
+            histogram.record(2000)
+            counter.add(3)
+
+        self.run_threads(record)
+        self.assertLessEqual(len(histogram._shards), 2)
+        self.assertLessEqual(len(counter._shards), 2)
+        self.assertEqual(counter.value, 600)
+        summary = histogram.summary(scale=1)
+        self.assertEqual(summary["count"], 401)
+        self.assertEqual((summary["min"], summary["max"]), (5, 2000))
+        self.assertEqual(summary["mean"], (5 + 200 * 2010) / 401)
+
+    def test_reset(self):
+        counter = metrics.Counter("test")
+        counter.add()
+        self.run_threads(counter.add, 10)
+        counter.reset()
+        self.assertEqual(counter.value, 0)
+        counter.add(2)
+        self.run_threads(counter.add, 10)
+        self.assertEqual(counter.value, 12)
+        self.assertLessEqual(len(counter._shards), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
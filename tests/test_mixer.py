@@ -0,0 +1,52 @@
+"""Tests for mate.mixer.Mixer."""
+import unittest
+
+import numpy as np
+
+from mate.drivers import MotorError
+from mate.mixer import AXES, Mixer
+
+
+class TestMixer(unittest.TestCase):
+
+    def setUp(self):
+        self.mixer = Mixer()
+
+    def test_neutral(self):
+        self.assertEqual(self.mixer.frame([0] * len(AXES)), {motor: 1500 for motor in range(6)})
+
+    def test_single_axis(self):
+        self.assertEqual(self.mixer.frame([0, 0, 1, 0, 0, 0]), {0: 1500, 1: 1500, 2: 1500, 3: 1500, 4: 1100, 5: 1100})
+        self.assertEqual(self.mixer.frame([0.5, 0, 0, 0, 0, 0]), {0: 1300, 1: 1300, 2: 1700, 3: 1700, 4: 1500, 5: 1500})
+
+    def test_output_is_scaled_to_full_thrust(self):
+        # Surge and yaw together ask 2x thrust of two thrusters, all are scaled by half.
+        thrust = self.mixer.thrust([1, 0, 0, 0, 0, 1])
+        np.testing.assert_allclose(thrust, [0, -1, 0, 1, 0, 0])
+        frames = self.mixer.pulse_widths(np.random.RandomState(1).uniform(-1, 1, (1000, len(AXES))))
+        self.assertGreaterEqual(frames.min(), 1100)
+        self.assertLessEqual(frames.max(), 1900)
+
+    def test_command_is_clamped(self):
+        self.assertEqual(self.mixer.frame([5, 0, 0, 0, 0, 0]), self.mixer.frame([1, 0, 0, 0, 0, 0]))
+        self.assertEqual(self.mixer.frame([0, 0, -5, 0, 0, 0]), self.mixer.frame([0, 0, -1, 0, 0, 0]))
+
+    def test_motors_neutral_and_span(self):
+        mixer = Mixer([[1, 0, 0, 0, 0, 0]], motors=[7], neutral=1450, span=200)
+        self.assertEqual(mixer.frame([1, 0, 0, 0, 0, 0]), {7: 1650})
+        self.assertEqual(mixer.frame([-0.5, 0, 0, 0, 0, 0]), {7: 1350})
+
+    def test_apply_writes_one_frame(self):
+        frames = []
+        frame = self.mixer.apply([0, 0, 0, 0, 0, 0.25], write=frames.append)
+        self.assertEqual(frames, [frame])
+
+    def test_invalid_matrix(self):
+        with self.assertRaises(MotorError):
+            Mixer([[1, 0, 0]])
+        with self.assertRaises(MotorError):
+            Mixer([[1, 0, 0, 0, 0, 0]], motors=[0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
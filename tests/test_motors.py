@@ -0,0 +1,74 @@
+"""Tests for mate.motors against the simulated PCA9685."""
+import unittest
+
+from mate import motors
+from mate.calibration import microseconds_to_ticks
+from mate.drivers.pca9685 import REGISTERS_PER_CHANNEL, led_register
+from mate.motors import MotorError
+from mate.utils.defaults import PWM_FREQUENCY
+
+
+def ticks(microseconds):
+    return int(microseconds_to_ticks(microseconds, PWM_FREQUENCY))
+
+
+class TestMotors(unittest.TestCase):
+
+    def setUp(self):
+        motors.configure("simulated", calibration={})
+        self.driver = motors.get_motor_driver()
+
+    def tearDown(self):
+        motors.configure()
+
+    def test_set_motor(self):
+        motors.set_motor(3, 1600)
+        self.assertEqual(self.driver.read_channel(3), ticks(1600))
+        self.assertEqual(motors.get_motor_status(), [{"motorid": 3, "pwm": 1600, "ticks": ticks(1600)}])
+
+    def test_unchanged_writes_are_skipped(self):
+        motors.set_motor(0, 1600)
+        transactions = self.driver.transactions
+        motors.set_motor(0, 1600)
+        # 1601 us is within the same tick as 1600 us.
+        motors.set_motor(0, 1601)
+        motors.set_motors({0: 1600})
+        self.assertEqual(self.driver.transactions, transactions)
+        self.assertEqual(motors.get_cache_stats(), {"hits": 3, "misses": 1})
+        self.assertEqual(motors.get_motor_status()[0]["pwm"], 1600)
+        motors.set_motor(0, 1700)
+        self.assertEqual(self.driver.transactions, transactions + 1)
+
+    def test_burst_covers_dirty_channels(self):
+        motors.set_motors([1500] * 8)
+        self.assertEqual(self.driver.transactions, 4 + 1)
+        transactions = self.driver.transactions
+        registers = bytearray(self.driver.registers)
+        motors.set_motors({0: 1500, 2: 1600, 3: 1650, 5: 1500, 7: 1400})
+        # Channels 2-3 in one burst and 7 in another, the unchanged ones are not written.
+        self.assertEqual(self.driver.transactions, transactions + 2)
+        for channel, microseconds in enumerate([1500, 1500, 1600, 1650, 1500, 1500, 1500, 1400]):
+            self.assertEqual(self.driver.read_channel(channel), ticks(microseconds))
+        changed = {
+            (register - led_register(0)) // REGISTERS_PER_CHANNEL
+            for register, (old, new) in enumerate(zip(registers, self.driver.registers))
+            if old != new
+        }
+        self.assertEqual(changed, {2, 3, 7})
+
+    def test_stop_all_motors(self):
+        motors.set_motors({0: 1800, 1: 1200})
+        motors.stop_all_motors()
+        self.assertEqual([self.driver.read_channel(channel) for channel in range(16)], [ticks(1500)] * 16)
+        self.assertEqual({motor["pwm"] for motor in motors.get_motor_status()}, {1500})
+
+    def test_out_of_range(self):
+        with self.assertRaises(MotorError):
+            motors.set_motor(16, 1500)
+        with self.assertRaises(MotorError):
+            motors.set_motors({0: 1500, 16: 1500})
+        self.assertEqual(motors.get_motor_status(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
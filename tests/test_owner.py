@@ -0,0 +1,49 @@
+"""Tests for mate.server.owner.RemoteOwner over loopback sockets."""
+import socket
+import time
+import unittest
+
+from mate.motors import MotorError
+from mate.protocol import decode_binary
+from mate.server.owner import RemoteOwner
+
+HOST = "127.0.0.1"
+
+
+class TestRemoteOwner(unittest.TestCase):
+
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind((HOST, 0))
+        self.server.settimeout(1.0)
+        address = "{}:{}".format(HOST, self.server.getsockname()[1])
+        self.owner = RemoteOwner(address, "http://{}:1".format(HOST))
+
+    def tearDown(self):
+        self.owner.client.close()
+        self.server.close()
+
+    def test_submit_does_not_wait_for_acknowledgements(self):
+        start = time.perf_counter()
+        for pwm in range(1000, 1300):
+            self.owner.submit({0: pwm})
+        self.assertLess(time.perf_counter() - start, self.owner.client.timeout)
+        self.assertEqual(self.owner.client.timeouts, 0)
+        self.assertEqual(decode_binary(self.server.recv(64)).frame, {0: 1000})
+
+    def test_errors_are_motor_errors(self):
+        with self.assertRaises(MotorError):
+            self.owner.submit({16: 1500})
+        with self.assertRaises(MotorError):
+            self.owner.submit({0: 70000})
+        self.owner.client.sock.close()
+        with self.assertRaises(MotorError):
+            self.owner.submit({0: 1500})
+
+    def test_status_error(self):
+        with self.assertRaises(MotorError):
+            self.owner.status()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Tests for the mate.protocol message formats."""
+import json
+import unittest
+
+from mate import protocol
+from mate.protocol import ProtocolError
+
+
+class TestBinary(unittest.TestCase):
+
+    def test_round_trip(self):
+        frame = {0: 1500, 3: 1100, 15: 1900}
+        message = protocol.decode_binary(protocol.encode_binary(frame, 7, timestamp=123))
+        self.assertEqual(message, protocol.Message(frame, 7, 123, None))
+
+    def test_traced_round_trip(self):
+        frame = {1: 1600}
+        data = protocol.encode_binary(frame, 8, timestamp=456, trace=99)
+        self.assertEqual(data[2], protocol.TRACE_VERSION)
+        self.assertEqual(len(data), protocol.binary_size(1, traced=True))
+        self.assertEqual(protocol.decode(data), protocol.Message(frame, 8, 456, 99))
+
+    def test_empty_frame(self):
+        message = protocol.decode_binary(protocol.encode_binary({}, 1, timestamp=0))
+        self.assertEqual(message.frame, {})
+
+    def test_sequence_is_masked(self):
+        message = protocol.decode_binary(protocol.encode_binary({0: 1500}, 2 ** 32 + 5, timestamp=0))
+        self.assertEqual(message.sequence, 5)
+
+    def test_pack_into_offset(self):
+        buffer = bytearray(4 + protocol.binary_size(2))
+        size = protocol.pack_binary_into(buffer, 4, {2: 1400, 5: 1550}, 3, timestamp=9)
+        self.assertEqual(size, protocol.binary_size(2))
+        self.assertEqual(protocol.decode_binary(memoryview(buffer)[4:]).frame, {2: 1400, 5: 1550})
+
+    def test_truncated(self):
+        data = protocol.encode_binary({0: 1500, 1: 1500}, 1, timestamp=0)
+        for size in (0, 2, protocol.HEADER.size - 1, protocol.HEADER.size, len(data) - 1):
+            with self.assertRaises(ProtocolError):
+                protocol.decode_binary(data[:size])
+
+    def test_oversized_count(self):
+        data = bytearray(protocol.encode_binary({0: 1500}, 1, timestamp=0))
+        data[3] = protocol.MAX_MOTORS + 1
+        with self.assertRaises(ProtocolError):
+            protocol.decode_binary(bytes(data) + bytes(64))
+
+    def test_bad_magic_and_version(self):
+        data = bytearray(protocol.encode_binary({0: 1500}, 1, timestamp=0))
+        with self.assertRaises(ProtocolError):
+            protocol.decode_binary(b"XX" + bytes(data[2:]))
+        data[2] = 9
+        with self.assertRaises(ProtocolError):
+            protocol.decode_binary(bytes(data))
+
+    def test_too_many_motors(self):
+        frame = {motor: 1500 for motor in range(protocol.MAX_MOTORS + 1)}
+        with self.assertRaises(ProtocolError):
+            protocol.encode_binary(frame, 1)
+
+    def test_value_out_of_range(self):
+        with self.assertRaises(ProtocolError):
+            protocol.encode_binary({0: 70000}, 1)
+        with self.assertRaises(ProtocolError):
+            protocol.encode_binary({256: 1500}, 1)
+
+
+class TestJson(unittest.TestCase):
+
+    def test_shapes(self):
+        self.assertEqual(protocol.decode_json('{"motorid": 1, "pwm": 1500}'), {1: 1500})
+        self.assertEqual(protocol.decode_json('{"motors": [{"motorid": 2, "pwm": 1600}]}'), {2: 1600})
+        self.assertEqual(protocol.decode_json('{"pwm": [1500, null, 1700]}'), {0: 1500, 2: 1700})
+
+    def test_round_trip(self):
+        frame = {0: 1500, 4: 1200}
+        self.assertEqual(protocol.decode_json(protocol.encode_json(frame)), frame)
+
+    def test_sequenced(self):
+        data = json.dumps({"motorid": 1, "pwm": 1500, "seq": 3, "ts": 10, "trace": 4}).encode()
+        self.assertEqual(protocol.decode(data), protocol.Message({1: 1500}, 3, 10, 4))
+        self.assertEqual(protocol.decode(b'{"motorid": 1, "pwm": 1500}').sequence, None)
+
+    def test_trace_fields(self):
+        self.assertEqual(protocol.trace_from_json({"motorid": 1, "pwm": 1500}), (None, None))
+        self.assertEqual(protocol.trace_from_json({"trace": "7", "ts": 12.0}), (7, 12))
+        for data in ({"trace": {"a": 1}}, {"trace": 1, "ts": "abc"}, {"ts": [1]}):
+            with self.assertRaises(ProtocolError):
+                protocol.trace_from_json(data)
+
+    def test_invalid(self):
+        for data in (b'{"motorid": 1', b'{"motorid": 1}', b'{"motorid": "a", "pwm": 1500}',
+                     b'{"motorid": 1, "pwm": 1500, "seq": "a"}', b'{"motorid": 1, "pwm": 1500, "ts": "a"}'):
+            with self.assertRaises(ProtocolError):
+                protocol.decode(data)
+
+
+class TestAck(unittest.TestCase):
+
+    def test_round_trip(self):
+        data = protocol.encode_ack(0xFFFFFFFF, protocol.HISTORY_MASK, 12345)
+        self.assertEqual(protocol.decode_ack(data), protocol.Ack(0xFFFFFFFF, protocol.HISTORY_MASK, 12345))
+
+    def test_invalid(self):
+        data = protocol.encode_ack(1, 0, 0)
+        with self.assertRaises(ProtocolError):
+            protocol.decode_ack(data[:-1])
+        with self.assertRaises(ProtocolError):
+            protocol.decode_ack(b"MT" + data[2:])
+
+
+class TestSequenceTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = protocol.SequenceTracker()
+
+    def test_sequence_newer_wraps(self):
+        self.assertTrue(protocol.sequence_newer(0, 0xFFFFFFFF))
+        self.assertTrue(protocol.sequence_newer(5, 0xFFFFFFF0))
+        self.assertFalse(protocol.sequence_newer(0xFFFFFFFF, 0))
+        self.assertFalse(protocol.sequence_newer(7, 7))
+
+    def test_history_across_wrap_around(self):
+        for sequence in (0xFFFFFFFE, 0xFFFFFFFF, 1):
+            self.tracker.observe("a", sequence)
+        ack = protocol.decode_ack(self.tracker.ack("a"))
+        self.assertEqual(ack.sequence, 1)
+        # 0 is missing, 0xFFFFFFFF and 0xFFFFFFFE were received.
+        self.assertEqual(ack.history, 0b110)
+        self.assertEqual(self.tracker.gaps, 1)
+        self.tracker.observe("a", 0)
+        self.assertEqual(protocol.decode_ack(self.tracker.ack("a")).history, 0b111)
+        self.assertEqual((self.tracker.reordered, self.tracker.gaps), (1, 0))
+
+    def test_duplicates_are_not_reordered(self):
+        for sequence in (1, 3, 2, 2, 3):
+            self.tracker.observe("a", sequence)
+        self.assertEqual((self.tracker.reordered, self.tracker.gaps), (1, 0))
+
+    def test_too_old(self):
+        self.tracker.observe("a", 1000)
+        self.tracker.observe("a", 1002)
+        self.tracker.observe("a", 1000 - protocol.ACK_HISTORY)
+        self.tracker.observe("a", 1000 - protocol.ACK_HISTORY)
+        self.assertEqual(self.tracker.too_old, 2)
+        self.assertEqual((self.tracker.reordered, self.tracker.gaps), (0, 1))
+
+    def accept(self, frame, sender, sequence):
+        pending = {}
+        accepted = {motor: pwm for motor, pwm in frame.items()
+                    if self.tracker.accept(motor, sender, sequence, pending)}
+        self.tracker.record(pending)
+        return accepted
+
+    def test_stale_values_are_dropped(self):
+        self.assertEqual(self.accept({0: 1600, 1: 1600}, "a", 0xFFFFFFFF), {0: 1600, 1: 1600})
+        self.assertEqual(self.accept({0: 1700}, "a", 0), {0: 1700})
+        self.assertEqual(self.accept({0: 1500, 1: 1500}, "a", 0xFFFFFFFF), {})
+        self.assertEqual(self.tracker.stale, 2)
+        # Other senders and unsequenced commands are always applied.
+        self.assertEqual(self.accept({0: 1500}, "b", 1), {0: 1500})
+        self.assertEqual(self.accept({0: 1400}, "a", None), {0: 1400})
+        self.assertEqual(self.accept({0: 1300}, "a", 0xFFFFFFF0), {0: 1300})
+
+    def test_pending_values_are_not_applied(self):
+        pending = {}
+        self.assertTrue(self.tracker.accept(0, "a", 5, pending))
+        self.assertFalse(self.tracker.accept(0, "a", 4, pending))
+        # Not recorded, so the same command is accepted again.
+        self.assertTrue(self.tracker.accept(0, "a", 5, {}))
+
+    def test_evict(self):
+        self.tracker.observe("a", 1)
+        self.accept({0: 1600}, "a", 1)
+        self.tracker.observe("b", 1)
+        self.accept({1: 1600}, "b", 1)
+        self.tracker.seen["a"] -= 10
+        self.assertEqual(self.tracker.evict(5), ["a"])
+        for state in (self.tracker.highest, self.tracker.history, self.tracker.timestamps, self.tracker.seen):
+            self.assertEqual(list(state), ["b"])
+        self.assertEqual(self.tracker.applied, {1: ("b", 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
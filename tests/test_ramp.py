@@ -0,0 +1,70 @@
+"""Tests for mate.ramp.RampEngine."""
+import unittest
+
+from mate.motors import MotorError
+from mate.ramp import RampEngine
+
+
+class FakeBus(object):
+    """Records published frames, publish_stop() only advances the generation."""
+
+    def __init__(self):
+        self.generation = 0
+        self.frames = []
+
+    def publish(self, frame, wait=False, generation=None, traces=None):
+        self.frames.append((frame, generation, traces))
+
+    def publish_stop(self, wait=False):
+        self.generation += 1
+
+
+class TestRampEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeBus()
+        # 1000 us/s at 10 ticks per second is 100 us per tick, channel 2 is not limited.
+        self.ramp = RampEngine(slew=[1000, 500, 0], rate=10, bus=self.bus, neutral=[1500] * 3)
+
+    def steps(self):
+        frames = []
+        while True:
+            frame = self.ramp.step()
+            if not frame:
+                return frames
+            frames.append(frame)
+
+    def test_slew_limit_per_tick(self):
+        self.ramp.submit({0: 1850})
+        self.assertEqual(self.steps(), [{0: 1600}, {0: 1700}, {0: 1800}, {0: 1850}])
+        self.ramp.submit({0: 1500})
+        self.assertEqual([frame[0] for frame in self.steps()], [1750, 1650, 1550, 1500])
+
+    def test_per_channel_limits(self):
+        self.ramp.submit({0: 1700, 1: 1400, 2: 1900})
+        self.assertEqual(self.steps(), [{0: 1600, 1: 1450, 2: 1900}, {0: 1700, 1: 1400}])
+        self.assertEqual([frame for frame, _, _ in self.bus.frames], [{0: 1600, 1: 1450, 2: 1900}, {0: 1700, 1: 1400}])
+
+    def test_new_target_while_moving(self):
+        self.ramp.submit({0: 1900})
+        self.ramp.step()
+        self.ramp.submit({0: 1400})
+        self.assertEqual([frame[0] for frame in self.steps()], [1500, 1400])
+
+    def test_stop_resets_to_neutral(self):
+        self.ramp.submit({0: 1900})
+        self.ramp.step()
+        self.ramp.halt()
+        self.assertEqual(self.ramp.step(), {})
+        self.ramp.submit({0: 1700})
+        self.assertEqual(self.steps(), [{0: 1600}, {0: 1700}])
+        self.assertEqual(self.bus.frames[-1][1], 1)
+
+    def test_invalid_frame(self):
+        with self.assertRaises(MotorError):
+            self.ramp.submit({3: 1500})
+        self.assertEqual(self.ramp.step(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for the batch handling of mate.server.udp.MotorServer."""
+import unittest
+
+from mate.motors import MotorError
+from mate.protocol import encode_binary, encode_json
+from mate.server.udp import ACK, MotorServer
+
+FIRST = ("10.0.0.1", 5000)
+SECOND = ("10.0.0.2", 5000)
+
+
+class FakeSocket(object):
+    """Socket returning queued datagrams, or errors, from recvfrom_into."""
+
+    def __init__(self, datagrams):
+        self.datagrams = list(datagrams)
+        self.sent = []
+
+    def recvfrom_into(self, buffer):
+        if not self.datagrams:
+            raise BlockingIOError()
+        data, address = self.datagrams.pop(0)
+        if isinstance(data, Exception):
+            raise data
+        buffer[:len(data)] = data
+        return len(data), address
+
+    def sendto(self, data, address):
+        self.sent.append((data, address))
+
+
+class FakeCoalescer(object):
+
+    channels = 16
+
+    def __init__(self, error=None):
+        self.error = error
+        self.frames = []
+
+    def submit(self, frame, traces=None):
+        if self.error is not None:
+            raise self.error
+        self.frames.append(frame)
+
+
+class TestMotorServer(unittest.TestCase):
+
+    def drain(self, datagrams, coalescer=None):
+        self.sock = FakeSocket(datagrams)
+        self.coalescer = coalescer or FakeCoalescer()
+        self.server = MotorServer(self.sock, self.coalescer, batch_size=8, ack_every=100)
+        self.server.drain()
+
+    def test_bad_datagram_is_rejected_alone(self):
+        self.drain([
+            (encode_binary({0: 1600}, 1, timestamp=0), FIRST),
+            (encode_binary({20: 1500}, 1, timestamp=0), SECOND),
+            (encode_json({1: 1700}), SECOND),
+        ])
+        self.assertEqual(self.coalescer.frames, [{0: 1600, 1: 1700}])
+        self.assertEqual(self.server.errors, 1)
+        # The sequenced command from FIRST waits for its cumulative acknowledgement.
+        (error, error_address), reply = self.sock.sent
+        self.assertEqual(error_address, SECOND)
+        self.assertIn(b"out of range", error)
+        self.assertEqual(reply, (ACK, SECOND))
+        # The rejected datagram is neither acknowledged nor recorded.
+        self.assertNotIn(SECOND, self.server.tracker.highest)
+
+    def test_failed_submit_is_not_recorded(self):
+        self.drain([(encode_binary({0: 1600}, 5, timestamp=0), FIRST)],
+                   FakeCoalescer(MotorError("Motor command bus is full.")))
+        self.assertEqual(self.sock.sent, [(b"Motor command bus is full.", FIRST)])
+        # A resend of the same command is not dropped as stale.
+        self.sock.datagrams.append((encode_binary({0: 1600}, 5, timestamp=0), FIRST))
+        self.coalescer.error = None
+        self.server.drain()
+        self.assertEqual(self.coalescer.frames, [{0: 1600}])
+        self.assertEqual(self.server.tracker.stale, 0)
+
+    def test_stale_values_are_dropped(self):
+        self.drain([
+            (encode_binary({0: 1600, 1: 1600}, 2, timestamp=0), FIRST),
+            (encode_binary({0: 1500}, 1, timestamp=0), FIRST),
+        ])
+        self.sock.datagrams.append((encode_binary({1: 1500}, 1, timestamp=0), FIRST))
+        self.server.drain()
+        self.assertEqual(self.coalescer.frames, [{0: 1600, 1: 1600}])
+        self.assertEqual(self.server.tracker.stale, 2)
+
+    def test_receive_error_does_not_leave_a_slot(self):
+        self.drain([
+            (encode_json({0: 1600}), FIRST),
+            (ConnectionRefusedError(), None),
+            (encode_json({1: 1700}), SECOND),
+        ])
+        self.assertEqual(self.server.received, 2)
+        self.assertEqual(self.coalescer.frames, [{0: 1600, 1: 1700}])
+        self.assertEqual(self.sock.sent, [(ACK, FIRST), (ACK, SECOND)])
+
+    def test_idle_senders_are_evicted(self):
+        self.drain([(encode_binary({0: 1600}, 1, timestamp=0), FIRST)])
+        self.assertEqual(self.server.unacknowledged, {FIRST: 1})
+        self.server.tracker.seen[FIRST] -= 10
+        self.server.evict(5)
+        self.assertEqual(self.server.unacknowledged, {})
+        self.assertEqual(self.server.tracker.highest, {})
+
+
+if __name__ == "__main__":
+    unittest.main()